@@ -0,0 +1,91 @@
+# backend/admission.py
+# Per-stage admission control for the upload pipeline. Each stage has a concurrency
+# limit and a bounded wait queue; when the queue is full (or a waiter times out) the
+# request is turned away with Retry-After instead of slowing everyone else down.
+import os
+import math
+import time
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import HTTPException
+
+CPU_COUNT = os.cpu_count() or 1
+
+class StageLimiter:
+    def __init__(self, name: str, concurrency: int, queue_size: int, timeout: float):
+        key = name.upper()
+        self.name = name
+        self.concurrency = max(1, int(os.getenv(f"ADMISSION_{key}_CONCURRENCY", concurrency)))
+        self.queue_size = max(0, int(os.getenv(f"ADMISSION_{key}_QUEUE", queue_size)))
+        self.timeout = float(os.getenv(f"ADMISSION_{key}_TIMEOUT", timeout))
+        self._sem = asyncio.Semaphore(self.concurrency)
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.avg_service = 1.0  # EWMA of seconds spent holding a slot
+
+    def retry_after(self) -> int:
+        # rough time for the current backlog to drain
+        return max(1, math.ceil(self.avg_service * (self.waiting + 1) / self.concurrency))
+
+    def _reject(self, status_code: int, reason: str):
+        raise HTTPException(
+            status_code=status_code,
+            detail=f"Server busy ({self.name}): {reason}. Please retry later.",
+            headers={"Retry-After": str(self.retry_after())}
+        )
+
+    @asynccontextmanager
+    async def slot(self):
+        if self._sem.locked() and self.waiting >= self.queue_size:
+            self.rejected += 1
+            self._reject(429, "queue full")
+        self.waiting += 1
+        start = time.monotonic()
+        try:
+            await asyncio.wait_for(self._sem.acquire(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            self._reject(503, "timed out waiting for a slot")
+        finally:
+            self.waiting -= 1
+        waited = time.monotonic() - start
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        self.admitted += 1
+        self.active += 1
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self.avg_service = 0.8 * self.avg_service + 0.2 * (time.monotonic() - started)
+            self._sem.release()
+
+    def stats(self) -> dict:
+        return {
+            "concurrency": self.concurrency,
+            "queue_size": self.queue_size,
+            "active": self.active,
+            "queue_depth": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "avg_wait_ms": round(1000 * self.total_wait / self.admitted, 2) if self.admitted else 0.0,
+            "max_wait_ms": round(1000 * self.max_wait, 2),
+            "avg_service_ms": round(1000 * self.avg_service, 2),
+        }
+
+# parsing and local scoring are CPU bound; LLM calls mostly wait on the network
+parsing = StageLimiter("parsing", concurrency=CPU_COUNT, queue_size=2 * CPU_COUNT, timeout=30)
+embedding = StageLimiter("embedding", concurrency=max(1, CPU_COUNT // 2), queue_size=2 * CPU_COUNT, timeout=30)
+llm = StageLimiter("llm", concurrency=8, queue_size=32, timeout=60)
+
+STAGES = {s.name: s for s in (parsing, embedding, llm)}
+
+def stats() -> dict:
+    return {name: s.stats() for name, s in STAGES.items()}
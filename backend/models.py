@@ -1,5 +1,5 @@
 import datetime
-from sqlalchemy import Column, Integer, String, Text, Float, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, BigInteger, String, Text, Float, ForeignKey, DateTime, LargeBinary, Index
 from sqlalchemy.orm import relationship
 from .database import Base # Corrected import
 
@@ -7,7 +7,7 @@ class User(Base):
     __tablename__ = "users"
     id = Column(Integer, primary_key=True, index=True)
     username = Column(String, unique=True, index=True)
-    password = Column(String)  # In production, use hashed passwords
+    password = Column(String)  # pbkdf2 hash, see backend/auth.py
     role = Column(String)  # 'user' or 'admin'
 
 class Job(Base):
@@ -17,6 +17,12 @@ class Job(Base):
     must_have = Column(Text)  # JSON string list
     good_to_have = Column(Text)  # JSON string list
     qualifications = Column(Text, nullable=True)
+    # score = hard_weight * hard_score + semantic_weight * semantic_score;
+    # verdict High above high_threshold, Medium above medium_threshold
+    hard_weight = Column(Float, default=0.6, server_default="0.6")
+    semantic_weight = Column(Float, default=0.4, server_default="0.4")
+    high_threshold = Column(Float, default=75.0, server_default="75.0")
+    medium_threshold = Column(Float, default=50.0, server_default="50.0")
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
     evaluations = relationship("Evaluation", back_populates="job")
 
@@ -44,4 +50,32 @@ class Evaluation(Base):
     summary = Column(Text)  # New field for LLM summary
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
     job = relationship("Job", back_populates="evaluations")
-    candidate = relationship("Candidate", back_populates="evaluations")
\ No newline at end of file
+    candidate = relationship("Candidate", back_populates="evaluations")
+
+class ResumeSignature(Base):
+    __tablename__ = "resume_signatures"
+    candidate_id = Column(Integer, ForeignKey("candidates.id"), primary_key=True)
+    minhash = Column(LargeBinary)  # 128 x uint32, see backend/dedup.py
+    duplicate_of = Column(Integer, ForeignKey("candidates.id"), nullable=True)
+    duplicate_similarity = Column(Float, nullable=True)
+    scheme = Column(Integer, default=1, server_default="1")  # dedup.SIGNATURE_SCHEME it was computed with
+
+class ResumeLSHBucket(Base):
+    __tablename__ = "resume_lsh_buckets"
+    # primary key doubles as the (band, bucket) lookup index
+    band = Column(Integer, primary_key=True)
+    bucket = Column(BigInteger, primary_key=True)
+    candidate_id = Column(Integer, ForeignKey("candidates.id"), primary_key=True)
+
+class LeaderboardEntry(Base):
+    # materialized per-job ranking, kept in step with evaluations (see backend/leaderboard.py)
+    __tablename__ = "leaderboard_entries"
+    evaluation_id = Column(Integer, ForeignKey("evaluations.id"), primary_key=True)
+    job_id = Column(Integer, ForeignKey("jobs.id"))
+    candidate_id = Column(Integer, ForeignKey("candidates.id"))
+    candidate_name = Column(String, nullable=True)
+    score = Column(Float)
+    verdict = Column(String)
+    hard_score = Column(Float)
+    semantic_score = Column(Float)
+    __table_args__ = (Index("ix_leaderboard_job_score", "job_id", "score"),)
\ No newline at end of file
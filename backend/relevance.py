@@ -1,4 +1,5 @@
 import json
+import numpy as np
 from backend.utils.preprocessing import clean_text, extract_skills_from_text
 from backend.utils.embeddings import similarity_between_texts
 from rapidfuzz import fuzz
@@ -36,6 +37,36 @@ def semantic_score(resume_text: str, job_text: str):
         sim_pct = 0.0
     return round(sim_pct, 2)
 
+DEFAULT_SCORING = {
+    "hard_weight": 0.6,
+    "semantic_weight": 0.4,
+    "high_threshold": 75.0,
+    "medium_threshold": 50.0,
+}
+
+def scoring_params(job_row) -> dict:
+    """The job's blend weights and verdict cutoffs, falling back to the defaults."""
+    params = {}
+    for key, default in DEFAULT_SCORING.items():
+        value = getattr(job_row, key, None)
+        params[key] = default if value is None else float(value)
+    return params
+
+def blend_scores(hard_scores, semantic_scores, params: dict):
+    """
+    Vectorized score blend + verdicts. Accepts scalars or arrays and returns
+    (scores, verdicts) as NumPy arrays; final_evaluate and re-weighting both use this
+    so a re-weighted score always equals what a fresh evaluation would give.
+    """
+    hard = np.asarray(hard_scores, dtype=float)
+    sem = np.asarray(semantic_scores, dtype=float)
+    scores = np.round(params["hard_weight"] * hard + params["semantic_weight"] * sem, 2)
+    verdicts = np.where(
+        scores > params["high_threshold"], "High",
+        np.where(scores > params["medium_threshold"], "Medium", "Low")
+    )
+    return scores, verdicts
+
 def final_evaluate(resume_text: str, job_row):
     must = json.loads(job_row.must_have or "[]")
     good = json.loads(job_row.good_to_have or "[]")
@@ -45,14 +76,9 @@ def final_evaluate(resume_text: str, job_row):
     jtxt = " ".join([job_row.title or ""] + must + good)
     sem = semantic_score(resume_text, jtxt)
 
-    overall = round(0.6 * hard["hard_score"] + 0.4 * sem, 2)
-    
-    if overall > 75:
-        verdict = "High"
-    elif overall > 50:
-        verdict = "Medium"
-    else:
-        verdict = "Low"
+    scores, verdicts = blend_scores(hard["hard_score"], sem, scoring_params(job_row))
+    overall = float(scores)
+    verdict = str(verdicts)
 
     feedback = []
     if len(hard["missing_must"]) > 0:
@@ -2,6 +2,7 @@
 import os
 import time
 from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
 import fitz # PyMuPDF
 import docx2txt
 
@@ -18,11 +19,8 @@ async def save_upload_file_tmp(upload_file: UploadFile) -> str:
         f.write(contents)
     return path
 
-async def parse_resume_file(upload_file: UploadFile):
-    """
-    returns tuple: (plain_text, saved_path)
-    """
-    saved_path = await save_upload_file_tmp(upload_file)
+def extract_text(saved_path: str) -> str:
+    """CPU-bound text extraction from a saved resume file (pdf, docx or plain text)."""
     text = ""
     if saved_path.lower().endswith(".pdf"):
         with fitz.open(saved_path) as doc:
@@ -41,4 +39,24 @@ async def parse_resume_file(upload_file: UploadFile):
                     text = f.read().decode("utf-8", errors="ignore")
                 except Exception:
                     text = ""
+    return text
+
+def discard_upload(saved_path: str):
+    """Deletes a saved upload that ended up with no candidate row."""
+    try:
+        os.remove(saved_path)
+    except FileNotFoundError:
+        pass
+
+async def parse_resume_file(upload_file: UploadFile):
+    """
+    returns tuple: (plain_text, saved_path)
+    """
+    saved_path = await save_upload_file_tmp(upload_file)
+    # extraction runs in the threadpool so large PDFs don't block the event loop
+    try:
+        text = await run_in_threadpool(extract_text, saved_path)
+    except BaseException:
+        discard_upload(saved_path)
+        raise
     return text, saved_path
\ No newline at end of file
@@ -0,0 +1,68 @@
+# backend/search.py
+# BM25 keyword search over candidate resumes, backed by a SQLite FTS5 table
+# that lives next to the main tables in resume_check.db.
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from backend import models
+from backend.utils.preprocessing import clean_text, tokenize
+
+FTS_TABLE = "resume_fts"
+# keep "c++" / "c#" as single tokens, like the skill list does
+TOKENIZER = "unicode61 tokenchars '+#'"
+
+def create_index(engine):
+    """Creates the FTS5 table if needed and indexes any candidates that are missing from it."""
+    with engine.begin() as conn:
+        conn.execute(text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(body, tokenize=\"{TOKENIZER}\")"
+        ))
+        rows = conn.execute(text(
+            f"SELECT id, resume_text FROM candidates WHERE id NOT IN (SELECT rowid FROM {FTS_TABLE})"
+        )).fetchall()
+        if rows:
+            conn.execute(
+                text(f"INSERT INTO {FTS_TABLE}(rowid, body) VALUES (:id, :body)"),
+                [{"id": r[0], "body": clean_text(r[1])} for r in rows]
+            )
+
+def index_candidate(db: Session, cand: models.Candidate):
+    """Adds (or replaces) one candidate's resume in the index. Caller commits."""
+    db.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :id"), {"id": cand.id})
+    db.execute(
+        text(f"INSERT INTO {FTS_TABLE}(rowid, body) VALUES (:id, :body)"),
+        {"id": cand.id, "body": clean_text(cand.resume_text)}
+    )
+
+def build_match_query(query: str) -> str:
+    """
+    Turns free text into an FTS5 OR-query of quoted terms so user input can't inject syntax.
+    FTS5 runs each quoted term through unicode61 itself, so "josé" matches an indexed
+    "jose" and "node.js" becomes the phrase "node js".
+    """
+    terms = dict.fromkeys(tokenize(query))
+    return " OR ".join('"' + t.replace('"', '""') + '"' for t in terms)
+
+def search_candidates(db: Session, query: str, job_id: int = None, limit: int = 20, offset: int = 0):
+    """
+    Returns candidates ranked by BM25 (best first) as dicts with a positive score.
+    If job_id is given, only candidates with an evaluation for that job are returned.
+    """
+    match = build_match_query(query)
+    if not match:
+        return []
+    sql = (
+        f"SELECT c.id, c.name, c.email, bm25({FTS_TABLE}) AS rank "
+        f"FROM {FTS_TABLE} JOIN candidates c ON c.id = {FTS_TABLE}.rowid "
+        f"WHERE {FTS_TABLE} MATCH :match "
+    )
+    params = {"match": match, "limit": limit, "offset": offset}
+    if job_id:
+        sql += "AND c.id IN (SELECT candidate_id FROM evaluations WHERE job_id = :job_id) "
+        params["job_id"] = job_id
+    sql += "ORDER BY rank LIMIT :limit OFFSET :offset"
+    rows = db.execute(text(sql), params).fetchall()
+    # FTS5's bm25() is "lower is better"; flip it so callers see higher = better
+    return [
+        {"candidate_id": r[0], "candidate_name": r[1], "email": r[2], "score": round(-r[3], 4)}
+        for r in rows
+    ]
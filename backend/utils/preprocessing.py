@@ -1,6 +1,7 @@
 # backend/utils/preprocessing.py
 import re
 import json
+import unicodedata
 from rapidfuzz import fuzz
 
 # Small skill list - extend as needed
@@ -12,6 +13,9 @@ COMMON_SKILLS = [
     "spark","hadoop","rest api","flask","fastapi","django","spring boot"
 ]
 
+# words in any script; "c++", "c#", "node.js" and "scikit-learn" stay whole
+WORD_RE = re.compile(r"[^\W_](?:[^\W_]|[+#]|[.\-](?=[^\W_]))*")
+
 def clean_text(text: str) -> str:
     if not text:
         return ""
@@ -19,6 +23,11 @@ def clean_text(text: str) -> str:
     s = re.sub(r"\s+", " ", s)
     return s.strip()
 
+def tokenize(text: str) -> list:
+    """Word tokens of clean_text(text). Shared by search, dedup and the hashing embedder."""
+    # NFC first: a decomposed "e" + combining accent would otherwise split the word
+    return WORD_RE.findall(unicodedata.normalize("NFC", clean_text(text)))
+
 def extract_skills_from_text(text: str, extra_skills: list = None, threshold: int = 85):
     """
     Return a list of skills found in text by checking COMMON_SKILLS + extra_skills.
@@ -0,0 +1,65 @@
+# backend/versions.py
+# Per-table change versions used for ETags on the list endpoints.
+# Versions live as file mtimes in VERSION_DIR so every uvicorn worker on the host
+# sees the same value, and checking them never touches the database.
+import os
+import time
+import hashlib
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+VERSION_DIR = os.getenv("TABLE_VERSION_DIR", os.path.join(".", ".table_versions"))
+
+def _path(table: str) -> str:
+    return os.path.join(VERSION_DIR, table)
+
+def bump(*tables: str):
+    """Marks tables as changed. Call this after writes that bypass the ORM unit of work."""
+    now = time.time_ns()
+    os.makedirs(VERSION_DIR, exist_ok=True)
+    for table in tables:
+        path = _path(table)
+        if not os.path.exists(path):
+            open(path, "a").close()
+        os.utime(path, ns=(now, now))
+
+def get_version(table: str) -> int:
+    try:
+        return os.stat(_path(table)).st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+def etag(request, *tables: str, scope: str = "") -> str:
+    """
+    Weak ETag over the given tables' versions plus the request path and query string.
+    scope distinguishes responses that differ per caller at the same URL.
+    """
+    versions = ",".join(f"{t}:{get_version(t)}" for t in tables)
+    raw = f"{versions}|{scope}|{request.url.path}?{request.url.query}"
+    return 'W/"' + hashlib.sha1(raw.encode("utf-8")).hexdigest()[:24] + '"'
+
+def is_not_modified(request, tag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    return header.strip() == "*" or tag in [t.strip() for t in header.split(",")]
+
+# --- ORM hooks: record which tables a session touched, bump them once it commits ---
+
+@event.listens_for(Session, "after_flush")
+def _track_flushed_tables(session, flush_context):
+    touched = session.info.setdefault("changed_tables", set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        table = getattr(obj, "__tablename__", None)
+        if table:
+            touched.add(table)
+
+@event.listens_for(Session, "after_commit")
+def _bump_committed_tables(session):
+    touched = session.info.pop("changed_tables", None)
+    if touched:
+        bump(*touched)
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_tables(session):
+    session.info.pop("changed_tables", None)
@@ -1,5 +1,6 @@
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
 import json
 from pathlib import Path
 import pandas as pd
@@ -64,6 +65,28 @@ st.markdown(
 # --- Constants & State Management ---
 API_BASE = "http://localhost:8000"
 USER_FILE = Path(__file__).parent / "users.json"
+CACHE_TTL = 30  # seconds; reruns and page switches within this window reuse API responses
+
+@st.cache_resource
+def get_http():
+    # one pooled session per Streamlit server, shared across reruns
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def auth_headers():
+    token = st.session_state.get("token")
+    return {"Authorization": f"Bearer {token}"} if token else {}
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def api_get(path, params=None, token=None):
+    # errors raise, so only successful responses end up in the cache;
+    # token is part of the cache key, so users never see each other's data
+    resp = get_http().get(f"{API_BASE}{path}", params=params, headers={"Authorization": f"Bearer {token}"} if token else None, timeout=30)
+    resp.raise_for_status()
+    return resp.json()
 
 def setup_users():
     if not USER_FILE.exists():
@@ -80,6 +103,7 @@ USERS = setup_users()
 if "logged_in" not in st.session_state:
     st.session_state.logged_in = False
     st.session_state.username = ""
+    st.session_state.token = ""
     st.session_state.role = ""
     st.session_state.admin_page = "main"
     st.session_state.view_candidate_name = None
@@ -94,11 +118,12 @@ def login_form():
         submitted = st.form_submit_button("Log In")
         if submitted:
             try:
-                resp = requests.post(f"{API_BASE}/login/", data={"username": username, "password": password})
+                resp = get_http().post(f"{API_BASE}/login/", data={"username": username, "password": password})
                 if resp.status_code == 200:
                     data = resp.json()
                     st.session_state.logged_in = True
                     st.session_state.username = username
+                    st.session_state.token = data.get("access_token", "")
                     st.session_state.role = data.get("role")
                     with st.spinner("Logging in..."):
                         time.sleep(1)
@@ -120,7 +145,7 @@ def signup_form():
                 st.error("Username and password are required.")
             else:
                 try:
-                    resp = requests.post(f"{API_BASE}/signup/", data={"username": new_username, "password": new_password})
+                    resp = get_http().post(f"{API_BASE}/signup/", data={"username": new_username, "password": new_password})
                     if resp.status_code == 200:
                         st.success("Account created successfully! Please log in.")
                         st.rerun()
@@ -165,7 +190,7 @@ def show_admin_portal():
         with st.sidebar:
             st.button("📊 View All Submissions", on_click=lambda: st.session_state.update(admin_page="submissions", view_candidate_name=None))
             st.button("➕ Create a New Job", on_click=lambda: st.session_state.update(admin_page="create_job"))
-            st.button("Logout", on_click=lambda: st.session_state.update(logged_in=False, username="", role="", admin_page="main"))
+            st.button("Logout", on_click=lambda: st.session_state.update(logged_in=False, username="", token="", role="", admin_page="main"))
 
         if st.session_state.admin_page == "create_job":
             st.header("➕ Create New Job Description")
@@ -176,9 +201,9 @@ def show_admin_portal():
                 qualifications = st.text_area("Qualifications / Notes (optional)")
                 submitted = st.form_submit_button("Create Job")
                 if submitted:
-                    params = {"username": st.session_state.username}
-                    resp = requests.post(f"{API_BASE}/jobs/", params=params, data={"title": title, "must_have": must_have, "good_to_have": good_to_have, "qualifications": qualifications})
+                    resp = get_http().post(f"{API_BASE}/jobs/", headers=auth_headers(), data={"title": title, "must_have": must_have, "good_to_have": good_to_have, "qualifications": qualifications})
                     if resp.status_code == 200:
+                        api_get.clear()
                         st.success("Job created: " + str(resp.json()))
                     else:
                         st.error(f"Failed: {resp.status_code} - {resp.text}")
@@ -186,15 +211,12 @@ def show_admin_portal():
         elif st.session_state.admin_page == "submissions":
             st.header("📊 All Candidate Submissions")
             try:
-                params = {"username": st.session_state.username}
-                evs = requests.get(f"{API_BASE}/evaluations/", params=params).json()
-                if not evs:
+                candidates = api_get("/candidates/", token=st.session_state.token)
+                if not candidates:
                     st.info("No evaluations found.")
                     return
-                df = pd.DataFrame(evs)
-                candidates = df.groupby('candidate_name')['job_title'].apply(list).reset_index()
                 st.subheader("Candidate List")
-                for _, row in candidates.iterrows():
+                for row in candidates:
                     col1, col2 = st.columns([0.7, 0.3])
                     with col1:
                         st.markdown(f"**{row['candidate_name']}**")
@@ -207,9 +229,8 @@ def show_admin_portal():
             st.header(f"Submissions for {st.session_state.view_candidate_name}")
             st.button("⬅️ Back to All Candidates", on_click=lambda: st.session_state.update(admin_page="submissions", view_candidate_name=None))
             try:
-                params = {"username": st.session_state.username}
-                evs = requests.get(f"{API_BASE}/evaluations/", params=params).json()
-                candidate_evals = [ev for ev in evs if ev.get('candidate_name') == st.session_state.view_candidate_name]
+                params = {"candidate_name": st.session_state.view_candidate_name}
+                candidate_evals = api_get("/evaluations/", params, token=st.session_state.token)
                 if not candidate_evals:
                     st.info("No submissions found for this candidate.")
                     return
@@ -250,12 +271,12 @@ def show_user_portal():
         with st.sidebar:
             st.button("📄 Upload Resume", on_click=lambda: st.session_state.update(user_page="upload"))
             st.button("📂 My Submissions", on_click=lambda: st.session_state.update(user_page="my_submissions", view_evaluation_id=None))
-            st.button("Logout", on_click=lambda: st.session_state.update(logged_in=False, username="", role="", user_page="main"))
+            st.button("Logout", on_click=lambda: st.session_state.update(logged_in=False, username="", token="", role="", user_page="main"))
             
         if st.session_state.user_page == "upload":
             st.header("📄 Upload Your Resume")
             try:
-                jobs = requests.get(f"{API_BASE}/jobs/").json()
+                jobs = api_get("/jobs/")
             except Exception:
                 jobs = []
             if jobs:
@@ -279,8 +300,9 @@ def show_user_portal():
                         data = {"job_id": str(job_id), "name": name or "", "email": email or ""}
                         try:
                             with st.spinner("Analyzing your resume..."):
-                                resp = requests.post(f"{API_BASE}/upload_resume/", data=data, files=files, timeout=120)
+                                resp = get_http().post(f"{API_BASE}/upload_resume/", data=data, files=files, timeout=120)
                                 if resp.status_code == 200:
+                                    api_get.clear()
                                     st.success("Evaluation complete!")
                                     st.session_state.user_page = "my_submissions"
                                     st.rerun()
@@ -292,12 +314,10 @@ def show_user_portal():
         elif st.session_state.user_page == "my_submissions":
             st.header("📂 My Submissions")
             try:
-                params = {"username": st.session_state.username} 
-                resp = requests.get(f"{API_BASE}/my_evaluations/", params=params)
-                if resp.status_code == 200:
-                    my_evals = resp.json()
-                else:
-                    st.error(f"Failed to fetch submissions: {resp.status_code} - {resp.text}")
+                try:
+                    my_evals = api_get("/my_evaluations/", token=st.session_state.token)
+                except requests.exceptions.HTTPError as e:
+                    st.error(f"Failed to fetch submissions: {e.response.status_code} - {e.response.text}")
                     return
                 if not my_evals:
                     st.info("You have no submissions yet. Upload a resume to get started!")
@@ -315,16 +335,13 @@ def show_user_portal():
             st.header("Submission Details")
             st.button("⬅️ Back to My Submissions", on_click=lambda: st.session_state.update(user_page="my_submissions", view_evaluation_id=None))
             try:
-                params = {"username": st.session_state.username}
-                resp = requests.get(f"{API_BASE}/my_evaluations/", params=params)
-                if resp.status_code == 200:
-                    my_evals = resp.json()
-                    selected_eval = next((ev for ev in my_evals if ev.get('evaluation_id') == st.session_state.view_evaluation_id), None)
-                else:
-                    st.error(f"Failed to fetch submissions: {resp.status_code} - {resp.text}")
-                    return
-                if not selected_eval:
-                    st.error("Submission not found.")
+                try:
+                    selected_eval = api_get(f"/evaluations/{st.session_state.view_evaluation_id}", token=st.session_state.token)
+                except requests.exceptions.HTTPError as e:
+                    if e.response.status_code == 404:
+                        st.error("Submission not found.")
+                    else:
+                        st.error(f"Failed to fetch submissions: {e.response.status_code} - {e.response.text}")
                     return
                 st.subheader(f"Job: {selected_eval['job_title']}")
                 col1, col2 = st.columns(2)
@@ -0,0 +1,57 @@
+# scripts/bench_auth.py
+# Auth overhead benchmark: conditional GETs to /my_evaluations/ through an in-process
+# TestClient. Every request is answered 304 from the ETag, so the time is dominated
+# by resolving the caller. Also counts DB queries per request.
+#
+# Run it from a scratch directory (the app creates resume_check.db in the cwd):
+#   cd "$(mktemp -d)" && python /path/to/repo/scripts/bench_auth.py --requests 3000
+#
+# --mode username benchmarks the old ?username= auth; run that one against a
+# checkout from before token auth (e.g. git worktree add /tmp/old 4031b2e~1).
+import os
+import sys
+import time
+import argparse
+import warnings
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-request auth cost")
+    parser.add_argument("--mode", choices=["token", "username"], default="token")
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--repo", default=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        help="checkout whose backend to import")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")
+    os.environ.setdefault("EMBEDDING_BACKEND", "hashing")
+    sys.path.insert(0, args.repo)
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event
+    from backend.app import app
+    from backend.database import engine
+
+    queries = [0]
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count(*_):
+        queries[0] += 1
+
+    client = TestClient(app)
+    if args.mode == "token":
+        login = client.post("/login/", data={"username": "user", "password": "user123"})
+        kwargs = {"headers": {"Authorization": f"Bearer {login.json()['access_token']}"}}
+    else:
+        kwargs = {"params": {"username": "user"}, "headers": {}}
+    first = client.get("/my_evaluations/", **kwargs)
+    first.raise_for_status()
+    kwargs["headers"]["If-None-Match"] = first.headers["etag"]
+
+    queries[0] = 0
+    start = time.perf_counter()
+    for _ in range(args.requests):
+        assert client.get("/my_evaluations/", **kwargs).status_code == 304
+    elapsed = time.perf_counter() - start
+    print(f"{args.mode}: {args.requests / elapsed:.0f} req/s, {queries[0] / args.requests:.2f} DB queries/request")
+
+if __name__ == "__main__":
+    main()
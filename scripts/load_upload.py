@@ -0,0 +1,80 @@
+# scripts/load_upload.py
+# Open-loop load test for /upload_resume/: fires uploads at a fixed arrival rate,
+# independent of how fast the server answers, and reports status codes, latency of
+# accepted uploads and the admission stats. Push the rate past what the server can
+# score to check that accepted requests keep a stable latency and the rest get
+# 429/503 with Retry-After instead of queueing.
+#
+#   EMBEDDING_BACKEND=hashing uvicorn backend.app:app --port 8000
+#   python scripts/load_upload.py --requests 240 --rate 16
+import time
+import random
+import asyncio
+import argparse
+import httpx
+
+WORDS = "python sql docker kubernetes aws developer engineer project built team led data pipeline".split()
+
+def make_resume(i: int, words: int) -> bytes:
+    # distinct text per upload, or near-duplicate detection would reuse one evaluation
+    rng = random.Random(i)
+    return " ".join(rng.choice(WORDS) if rng.random() < 0.5 else f"term{rng.randrange(50000)}" for _ in range(words)).encode()
+
+def percentile(values: list, p: float) -> float:
+    return values[min(len(values) - 1, int(p * len(values)))] if values else float("nan")
+
+async def run(args):
+    async with httpx.AsyncClient(base_url=args.base, timeout=args.timeout) as client:
+        login = await client.post("/login/", data={"username": args.username, "password": args.password})
+        login.raise_for_status()
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+        job = await client.post("/jobs/", headers=headers, data={
+            "title": "Load test", "must_have": "python, sql, golang, rust", "good_to_have": "docker, terraform"
+        })
+        job.raise_for_status()
+        job_id = job.json()["id"]
+
+        latencies, codes, retry_after = [], {}, []
+
+        async def one(i: int):
+            body = make_resume(i, args.words)
+            await asyncio.sleep(i / args.rate)
+            start = time.perf_counter()
+            resp = await client.post(
+                "/upload_resume/",
+                data={"job_id": job_id, "name": f"load-{i}"},
+                files={"file": (f"resume_{i}.txt", body)}
+            )
+            codes[resp.status_code] = codes.get(resp.status_code, 0) + 1
+            if resp.status_code == 200:
+                latencies.append(time.perf_counter() - start)
+            elif "retry-after" in resp.headers:
+                retry_after.append(int(resp.headers["retry-after"]))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(args.requests)))
+        wall = time.perf_counter() - started
+        latencies.sort()
+        print(f"{args.requests} uploads at {args.rate}/s in {wall:.1f}s, status codes: {dict(sorted(codes.items()))}")
+        if latencies:
+            print(f"accepted latency p50={percentile(latencies, .5):.2f}s "
+                  f"p95={percentile(latencies, .95):.2f}s max={latencies[-1]:.2f}s")
+        if retry_after:
+            print(f"Retry-After on rejections: min={min(retry_after)}s max={max(retry_after)}s")
+        stats = await client.get("/admission/", headers=headers)
+        for stage, s in stats.json().items():
+            print(f"{stage}: {s}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Open-loop load test for resume uploads")
+    parser.add_argument("--base", default="http://127.0.0.1:8000")
+    parser.add_argument("--requests", type=int, default=240)
+    parser.add_argument("--rate", type=float, default=16.0, help="uploads started per second")
+    parser.add_argument("--words", type=int, default=20000, help="size of the generated resume")
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="admin123")
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+# tests/conftest.py
+import os
+import sys
+import tempfile
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# the backend keeps its SQLite DB, ETag versions and signing key relative to the
+# working directory, so the suite runs in a scratch one
+os.chdir(tempfile.mkdtemp(prefix="resume_tests_"))
+os.environ.setdefault("SESSION_SECRET", "test-secret")
+
+@pytest.fixture(scope="session")
+def backend_app():
+    from backend import app
+    return app
+
+@pytest.fixture
+def client(backend_app):
+    from fastapi.testclient import TestClient
+    with TestClient(backend_app.app) as c:
+        yield c
+
+@pytest.fixture
+def admin_headers(client):
+    token = client.post("/login/", data={"username": "admin", "password": "admin123"}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+@pytest.fixture
+def db(backend_app):
+    session = backend_app.SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
@@ -0,0 +1,93 @@
+# tests/test_admission.py
+import os
+import asyncio
+from contextlib import asynccontextmanager
+import pytest
+from fastapi import HTTPException
+from backend import admission, models, resume_parser
+from backend.admission import StageLimiter
+
+def _limiter(monkeypatch, **kwargs):
+    for key in ("CONCURRENCY", "QUEUE", "TIMEOUT"):
+        monkeypatch.delenv(f"ADMISSION_TEST_{key}", raising=False)
+    return StageLimiter("test", **kwargs)
+
+async def _hold(limiter, release: asyncio.Event):
+    async with limiter.slot():
+        await release.wait()
+
+def test_full_queue_returns_429_with_retry_after(monkeypatch):
+    limiter = _limiter(monkeypatch, concurrency=1, queue_size=1, timeout=5)
+
+    async def scenario():
+        release = asyncio.Event()
+        holder = asyncio.create_task(_hold(limiter, release))
+        waiter = asyncio.create_task(_hold(limiter, release))
+        await asyncio.sleep(0.01)
+        assert limiter.active == 1 and limiter.waiting == 1
+        with pytest.raises(HTTPException) as exc:
+            async with limiter.slot():
+                pass
+        release.set()
+        await asyncio.gather(holder, waiter)
+        return exc.value
+
+    err = asyncio.run(scenario())
+    assert err.status_code == 429
+    assert int(err.headers["Retry-After"]) >= 1
+    stats = limiter.stats()
+    assert stats["rejected"] == 1 and stats["admitted"] == 2
+    assert stats["active"] == 0 and stats["queue_depth"] == 0
+
+def test_wait_timeout_returns_503_with_retry_after(monkeypatch):
+    limiter = _limiter(monkeypatch, concurrency=1, queue_size=4, timeout=0.05)
+
+    async def scenario():
+        release = asyncio.Event()
+        holder = asyncio.create_task(_hold(limiter, release))
+        await asyncio.sleep(0.01)
+        with pytest.raises(HTTPException) as exc:
+            async with limiter.slot():
+                pass
+        release.set()
+        await holder
+        return exc.value
+
+    err = asyncio.run(scenario())
+    assert err.status_code == 503
+    assert int(err.headers["Retry-After"]) >= 1
+    assert limiter.timed_out == 1 and limiter.waiting == 0
+
+def test_slot_is_released_after_errors(monkeypatch):
+    limiter = _limiter(monkeypatch, concurrency=1, queue_size=0, timeout=1)
+
+    async def scenario():
+        with pytest.raises(RuntimeError):
+            async with limiter.slot():
+                raise RuntimeError("boom")
+        async with limiter.slot():
+            pass
+
+    asyncio.run(scenario())
+    assert limiter.admitted == 2 and limiter.active == 0
+
+class _FullLimiter(StageLimiter):
+    @asynccontextmanager
+    async def slot(self):
+        self.rejected += 1
+        self._reject(429, "queue full")
+        yield
+
+def test_rejected_upload_leaves_no_file(client, db, monkeypatch):
+    job = models.Job(title="Overloaded", must_have="[]", good_to_have="[]")
+    db.add(job)
+    db.commit()
+    monkeypatch.setattr(admission, "embedding", _FullLimiter("embedding", concurrency=1, queue_size=0, timeout=1))
+    before = set(os.listdir(resume_parser.UPLOAD_DIR))
+    text = " ".join(f"overload{i}" for i in range(200))
+    resp = client.post("/upload_resume/", data={"job_id": job.id, "name": "late"},
+                       files={"file": ("late.txt", text.encode())})
+    assert resp.status_code == 429
+    assert "Retry-After" in resp.headers
+    assert set(os.listdir(resume_parser.UPLOAD_DIR)) == before
+    assert db.query(models.Candidate).filter(models.Candidate.name == "late").count() == 0
@@ -0,0 +1,65 @@
+# tests/test_auth.py
+from backend import auth, models
+
+def _login(client, username, password):
+    return client.post("/login/", data={"username": username, "password": password})
+
+def test_password_hash_roundtrip():
+    stored = auth.hash_password("s3cret")
+    assert auth.is_hashed(stored)
+    assert auth.verify_password("s3cret", stored)
+    assert not auth.verify_password("wrong", stored)
+
+def test_token_roundtrip():
+    assert auth.decode_token(auth.create_token(42)) == 42
+
+def test_tampered_token_is_rejected():
+    token = auth.create_token(42)
+    payload, sig = token.split(".")
+    forged = auth._b64(b'{"sub":1,"exp":9999999999}')
+    assert auth.decode_token(f"{forged}.{sig}") is None
+    assert auth.decode_token(f"{payload}.{sig[:-1]}{'A' if sig[-1] != 'A' else 'B'}") is None
+    assert auth.decode_token(payload) is None
+
+def test_non_ascii_signature_is_rejected():
+    assert auth.decode_token("abc.\xe9") is None
+    assert auth.decode_token("\xe9.\xe9") is None
+
+def test_expired_token_is_rejected():
+    assert auth.decode_token(auth.create_token(42, ttl=-10)) is None
+
+def test_login_upgrades_plaintext_password(client, db):
+    db.add(models.User(username="legacy", password="legacy123", role="user"))
+    db.commit()
+    resp = _login(client, "legacy", "legacy123")
+    assert resp.status_code == 200
+    db.expire_all()
+    user = db.query(models.User).filter(models.User.username == "legacy").one()
+    assert auth.is_hashed(user.password)
+    assert auth.verify_password("legacy123", user.password)
+    # the upgraded hash still logs in and the token authenticates
+    token = _login(client, "legacy", "legacy123").json()["access_token"]
+    assert client.get("/my_evaluations/", headers={"Authorization": f"Bearer {token}"}).status_code == 200
+
+def test_wrong_password_is_rejected(client):
+    assert _login(client, "admin", "nope").status_code == 400
+
+def test_protected_endpoint_returns_401(client):
+    assert client.get("/my_evaluations/").status_code == 401
+    for token in ["garbage", "abc.\xe9", auth.create_token(1, ttl=-10), auth.create_token(999999)]:
+        # latin-1 bytes so the non-ASCII token reaches the server as-is
+        resp = client.get("/my_evaluations/", headers={"Authorization": f"Bearer {token}".encode("latin-1")})
+        assert resp.status_code == 401
+        assert resp.headers["WWW-Authenticate"] == "Bearer"
+
+def test_unknown_username_costs_a_password_check(client, monkeypatch):
+    checked = []
+    verify = auth.verify_password
+
+    def spy(password, stored):
+        checked.append(stored)
+        return verify(password, stored)
+
+    monkeypatch.setattr(auth, "verify_password", spy)
+    assert _login(client, "no-such-user", "whatever").status_code == 400
+    assert checked == [auth.dummy_hash()] and auth.is_hashed(checked[0])
@@ -0,0 +1,93 @@
+# tests/test_dedup.py
+import numpy as np
+from backend import dedup, models
+from backend.database import engine
+
+def _pair(rng, jaccard):
+    """Two signatures that agree in exactly `jaccard` of their positions."""
+    a = rng.randint(0, 2 ** 31, size=dedup.NUM_PERM).astype(np.uint32)
+    b = a.copy()
+    differ = rng.choice(dedup.NUM_PERM, size=round((1 - jaccard) * dedup.NUM_PERM), replace=False)
+    b[differ] += 1
+    return a, b
+
+def _share_bucket(a, b):
+    return bool(set(dedup.band_buckets(a)) & set(dedup.band_buckets(b)))
+
+def test_pairs_at_flag_threshold_share_a_bucket():
+    rng = np.random.RandomState(0)
+    pairs = [_pair(rng, dedup.FLAG_THRESHOLD) for _ in range(500)]
+    assert all(_share_bucket(a, b) for a, b in pairs)
+
+def test_near_duplicate_resume_is_found(db):
+    words = [f"w{i}" for i in range(300)]
+    original = " ".join(words)
+    edited = " ".join(words[:290] + ["x1", "x2", "x3", "x4", "x5"] + words[295:])
+    cand = models.Candidate(name="dup", resume_text=original)
+    db.add(cand)
+    db.flush()
+    dedup.add_signature(db, cand.id, dedup.minhash(original))
+    db.commit()
+    found = dedup.find_near_duplicate(dedup.minhash(edited))
+    assert found is not None and found["candidate_id"] == cand.id
+
+def _resume(prefix, n=120):
+    return " ".join(f"{prefix}{i}" for i in range(n))
+
+def test_create_index_rebuilds_buckets_from_old_layout(db):
+    cand = models.Candidate(name="old", resume_text=_resume("layout"))
+    db.add(cand)
+    db.flush()
+    sig = dedup.minhash(cand.resume_text)
+    db.add(models.ResumeSignature(candidate_id=cand.id, minhash=sig.tobytes(), scheme=dedup.SIGNATURE_SCHEME))
+    db.query(models.ResumeLSHBucket).delete()
+    db.add(models.ResumeLSHBucket(band=0, bucket=12345, candidate_id=cand.id))  # stale layout
+    db.commit()
+    dedup.create_index(engine)
+    db.expire_all()
+    stored = set(
+        db.query(models.ResumeLSHBucket.band, models.ResumeLSHBucket.bucket)
+        .filter(models.ResumeLSHBucket.candidate_id == cand.id)
+    )
+    assert stored == set(dedup.band_buckets(sig))
+    assert dedup.find_near_duplicate(sig)["candidate_id"] == cand.id
+
+def test_create_index_recomputes_old_scheme_signatures(db):
+    cand = models.Candidate(name="scheme", resume_text=_resume("scheme"))
+    db.add(cand)
+    db.flush()
+    stale = np.arange(dedup.NUM_PERM, dtype=np.uint32)
+    db.add(models.ResumeSignature(candidate_id=cand.id, minhash=stale.tobytes(), scheme=1))
+    for band, bucket in dedup.band_buckets(stale):
+        db.add(models.ResumeLSHBucket(band=band, bucket=bucket, candidate_id=cand.id))
+    db.commit()
+    dedup.create_index(engine)
+    db.expire_all()
+    row = db.get(models.ResumeSignature, cand.id)
+    sig = dedup.minhash(cand.resume_text)
+    assert row.scheme == dedup.SIGNATURE_SCHEME and row.minhash == sig.tobytes()
+    assert dedup.find_near_duplicate(sig)["candidate_id"] == cand.id
+
+SKILLS = "Python, SQL, Docker, AWS, Kubernetes, 2015, 2019, 2021"
+
+def test_different_non_latin_resumes_are_not_flagged(db):
+    a = ("Иван Петров. Инженер данных в банке: строил хранилище данных, настраивал "
+         "потоковую загрузку событий, обучал младших коллег, отвечал за качество отчётов "
+         "для финансового отдела и автоматизацию сверок. Навыки: " + SKILLS)
+    b = ("Мария Смирнова. Разработчица мобильных игр в студии: проектировала игровые "
+         "механики, писала серверную часть турниров, оптимизировала загрузку уровней "
+         "и вела интеграцию платёжных систем для магазина. Навыки: " + SKILLS)
+    sig_a, sig_b = dedup.minhash(a), dedup.minhash(b)
+    assert dedup.similarity(sig_a, sig_b) < dedup.FLAG_THRESHOLD
+    cand = models.Candidate(name="ivan", resume_text=a)
+    db.add(cand)
+    db.flush()
+    dedup.add_signature(db, cand.id, sig_a)
+    db.commit()
+    assert dedup.find_near_duplicate(sig_b) is None
+    assert dedup.find_near_duplicate(sig_a)["candidate_id"] == cand.id
+
+def test_short_resumes_are_never_flagged(db):
+    text = "Python SQL Docker AWS 2015"
+    assert (dedup.minhash(text) == dedup.EMPTY_SIGNATURE).all()
+    assert dedup.find_near_duplicate(dedup.minhash(text)) is None
@@ -0,0 +1,38 @@
+# tests/test_embedding_server.py
+import os
+import time
+import asyncio
+import threading
+import numpy as np
+import pytest
+from backend import embedding_server
+from backend.utils import embeddings
+
+@pytest.fixture(scope="module")
+def server_socket(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("embed") / "s.sock")
+    thread = threading.Thread(
+        target=lambda: asyncio.run(embedding_server.serve(path, "hashing", max_batch=64, max_wait=0.002)),
+        daemon=True
+    )
+    thread.start()
+    deadline = time.time() + 10
+    while not os.path.exists(path):
+        assert time.time() < deadline, "embedding server did not start"
+        time.sleep(0.05)
+    return path
+
+def test_remote_matches_local(server_socket):
+    remote = embeddings.RemoteBackend(server_socket, "hashing")
+    texts = [f"python developer {i}" for i in range(10)]
+    local = embeddings.get_backend("hashing", local=True).encode(texts)
+    assert np.allclose(remote.encode(texts), local, atol=1e-6)
+
+def test_bulk_encode_reuses_the_callers_connection(server_socket):
+    remote = embeddings.RemoteBackend(server_socket, "hashing")
+    texts = [f"resume {i}" for i in range(3 * remote.batch_size + 5)]
+    assert remote.encode(texts).shape[0] == len(texts)
+    sock = remote.client._local.sock
+    assert sock is not None
+    remote.encode(texts)
+    assert remote.client._local.sock is sock
@@ -0,0 +1,31 @@
+# tests/test_embeddings.py
+import numpy as np
+from backend.utils import embeddings
+
+def test_default_backend_is_resolvable(monkeypatch):
+    monkeypatch.delenv("EMBEDDING_BACKEND", raising=False)
+    monkeypatch.delenv("EMBEDDING_SERVER_SOCKET", raising=False)
+    assert isinstance(embeddings.get_backend(), embeddings.AutoBackend)
+
+def test_auto_falls_back_when_gemini_fails(monkeypatch):
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+    monkeypatch.delenv("EMBEDDING_SERVER_SOCKET", raising=False)
+    # stand in for MiniLM so the test doesn't need torch or a model download
+    monkeypatch.setitem(embeddings._backend_cache, "minilm", embeddings.HashingBackend())
+    emb = embeddings.embed_texts(["python developer", "java developer"], backend="auto")
+    assert emb.shape[0] == 2 and np.isfinite(emb).all()
+
+def test_minilm_leaves_torch_threads_alone_by_default(monkeypatch):
+    monkeypatch.delenv("EMBEDDING_MINILM_THREADS", raising=False)
+    assert embeddings.MiniLMBackend().torch_threads is None
+    monkeypatch.setenv("EMBEDDING_MINILM_THREADS", "3")
+    assert embeddings.MiniLMBackend().torch_threads == 3
+
+def test_hashing_embeds_non_latin_text():
+    backend = embeddings.HashingBackend()
+    resume = "Инженер данных. Опыт работы с Python и SQL, построение конвейеров данных."
+    job = "Ищем инженера данных: построение конвейеров данных, Python, SQL."
+    other = "Повар ресторана, приготовление блюд европейской кухни, Python, SQL."
+    vec = backend.embed(resume)
+    assert np.count_nonzero(vec) > 10
+    assert embeddings._cosine(vec, backend.embed(job)) > embeddings._cosine(vec, backend.embed(other))
@@ -0,0 +1,31 @@
+# tests/test_evaluations.py
+import pytest
+from backend import models
+
+@pytest.fixture
+def submissions(db):
+    job = models.Job(title="Backend Engineer", must_have="[]", good_to_have="[]")
+    db.add(job)
+    db.flush()
+    for name in ["alice", "alice", None, ""]:
+        cand = models.Candidate(name=name, resume_text="python sql")
+        db.add(cand)
+        db.flush()
+        db.add(models.Evaluation(job_id=job.id, candidate_id=cand.id, score=50.0, verdict="Medium", missing_skills="[]"))
+    db.commit()
+    return job
+
+def test_candidate_summaries_skip_nameless_uploads(client, admin_headers, submissions):
+    rows = client.get("/candidates/", headers=admin_headers).json()
+    names = [r["candidate_name"] for r in rows]
+    assert None not in names and "" not in names
+    assert next(r for r in rows if r["candidate_name"] == "alice")["submissions"] == 2
+
+def test_empty_candidate_name_filters_instead_of_returning_everything(client, admin_headers, submissions):
+    params = {"job_id": submissions.id}
+    everything = client.get("/evaluations/", params=params, headers=admin_headers).json()
+    assert len(everything) == 4
+    empty = client.get("/evaluations/", params={**params, "candidate_name": ""}, headers=admin_headers).json()
+    assert len(empty) == 1
+    alice = client.get("/evaluations/", params={**params, "candidate_name": "alice"}, headers=admin_headers).json()
+    assert len(alice) == 2
@@ -0,0 +1,49 @@
+# tests/test_export.py
+import csv
+import io
+import time
+import orjson
+from backend import export, models
+
+def test_csv_export_neutralises_formulas(db):
+    job = models.Job(title="QA", must_have="[]", good_to_have="[]")
+    cand = models.Candidate(name='=HYPERLINK("http://evil","x")', email="@evil", resume_text="")
+    db.add_all([job, cand])
+    db.flush()
+    db.add(models.Evaluation(job_id=job.id, candidate_id=cand.id, score=-1.0, verdict="Low",
+                             missing_skills='["+sum(1)"]', feedback="-2+3", summary="fine"))
+    db.commit()
+    rows = list(csv.DictReader(io.StringIO("".join(export.iter_csv(job.id)))))
+    assert len(rows) == 1
+    row = rows[0]
+    assert row["candidate_name"] == '\'=HYPERLINK("http://evil","x")'
+    assert row["candidate_email"] == "'@evil"
+    assert row["missing_skills"] == "'+sum(1)"
+    assert row["feedback"] == "'-2+3"
+    assert row["summary"] == "fine"
+    assert row["score"] == "-1.0"  # numbers are left alone
+    # NDJSON is data, not a spreadsheet: values stay as stored
+    record = orjson.loads(b"".join(export.iter_ndjson(job.id)))
+    assert record["candidate_name"] == '=HYPERLINK("http://evil","x")'
+
+def test_open_export_does_not_block_writers(db):
+    job = models.Job(title="Bulk", must_have="[]", good_to_have="[]")
+    db.add(job)
+    db.flush()
+    cand = models.Candidate(name="bulk", resume_text="")
+    db.add(cand)
+    db.flush()
+    db.add_all([
+        models.Evaluation(job_id=job.id, candidate_id=cand.id, score=1.0, verdict="Low", missing_skills="[]")
+        for _ in range(export.CHUNK_SIZE + 500)
+    ])
+    db.commit()
+    stream = export.iter_csv(job.id)
+    next(stream)  # mid-stream: the export's read transaction is open
+    try:
+        start = time.monotonic()
+        db.add(models.Candidate(name="writer", resume_text=""))
+        db.commit()
+        assert time.monotonic() - start < 1.0
+    finally:
+        stream.close()
@@ -0,0 +1,65 @@
+# tests/test_leaderboard.py
+import pytest
+from backend import models, leaderboard, relevance
+from backend.database import SessionLocal
+
+@pytest.fixture
+def job(db):
+    job = models.Job(title="Data Analyst", must_have="[]", good_to_have="[]")
+    db.add(job)
+    db.flush()
+    for hard, sem in [(80.0, 40.0), (20.0, 90.0)]:
+        cand = models.Candidate(name="bob", resume_text="sql")
+        db.add(cand)
+        db.flush()
+        ev = models.Evaluation(job_id=job.id, candidate_id=cand.id, hard_score=hard, semantic_score=sem,
+                               score=0.6 * hard + 0.4 * sem, verdict="Medium", missing_skills="[]")
+        db.add(ev)
+        db.flush()
+        leaderboard.add_entry(db, ev, cand.name)
+    db.commit()
+    return job
+
+def test_reweight_rescores_evaluations_and_leaderboard(client, admin_headers, job):
+    resp = client.put(f"/jobs/{job.id}/scoring", data={"hard_weight": 0, "semantic_weight": 1}, headers=admin_headers)
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["updated"] == 2
+    assert [e["score"] for e in body["leaderboard"]] == [90.0, 40.0]
+
+@pytest.mark.parametrize("field", ["hard_weight", "semantic_weight", "high_threshold", "medium_threshold"])
+@pytest.mark.parametrize("value", ["nan", "inf", "-inf"])
+def test_reweight_rejects_non_finite_values(client, admin_headers, job, db, field, value):
+    resp = client.put(f"/jobs/{job.id}/scoring", data={field: value}, headers=admin_headers)
+    assert resp.status_code == 400
+    db.expire_all()
+    assert all(e.score is not None for e in db.query(models.Evaluation).filter(models.Evaluation.job_id == job.id))
+
+def test_upload_uses_weights_set_while_it_was_scoring(client, db, monkeypatch):
+    monkeypatch.setenv("EMBEDDING_BACKEND", "hashing")
+    job = models.Job(title="Python developer", must_have='["python", "docker"]', good_to_have="[]")
+    db.add(job)
+    db.commit()
+    original = relevance.final_evaluate
+
+    def evaluate_then_reweight(resume_text, job_row):
+        ev = original(resume_text, job_row)
+        # PUT /jobs/{id}/scoring commits while the upload is still in flight
+        other = SessionLocal()
+        try:
+            leaderboard.reweight_job(other, other.get(models.Job, job.id), {"hard_weight": 1.0, "semantic_weight": 0.0})
+        finally:
+            other.close()
+        return ev
+
+    monkeypatch.setattr(relevance, "final_evaluate", evaluate_then_reweight)
+    text = "Python developer. " + " ".join(f"raceword{i}" for i in range(100))
+    resp = client.post("/upload_resume/", data={"job_id": job.id, "name": "racer"}, files={"file": ("race.txt", text.encode())})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert 0 < body["hard_score"] < 100 and body["semantic_score"] > 0
+    assert body["score"] == round(body["hard_score"], 2)
+    db.expire_all()
+    ev = db.get(models.Evaluation, body["evaluation_id"])
+    entry = db.query(models.LeaderboardEntry).filter(models.LeaderboardEntry.evaluation_id == ev.id).one()
+    assert ev.score == entry.score == round(ev.hard_score, 2)
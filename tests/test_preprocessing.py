@@ -0,0 +1,11 @@
+# tests/test_preprocessing.py
+from backend.utils.preprocessing import tokenize
+
+def test_tokenize_keeps_skills_whole():
+    assert tokenize("C++, C#, Node.js and scikit-learn.") == ["c++", "c#", "node.js", "and", "scikit-learn"]
+
+def test_tokenize_handles_any_script():
+    assert tokenize("José Müller") == ["josé", "müller"]
+    assert tokenize("José") == ["josé"]  # decomposed accent
+    assert tokenize("Инженер данных, 数据工程师") == ["инженер", "данных", "数据工程师"]
+    assert tokenize("foo_bar") == ["foo", "bar"]
@@ -0,0 +1,34 @@
+# tests/test_search.py
+import pytest
+from backend import models, search
+
+@pytest.fixture
+def indexed(db):
+    resumes = {
+        "jose": "Jose Muller, data engineer. Spark and C++.",
+        "li": "李 数据工程师 python",
+    }
+    ids = {}
+    for key, text in resumes.items():
+        cand = models.Candidate(name=key, resume_text=text)
+        db.add(cand)
+        db.flush()
+        search.index_candidate(db, cand)
+        ids[key] = cand.id
+    db.commit()
+    return ids
+
+def test_match_query_keeps_non_ascii_words():
+    assert search.build_match_query("José Müller") == '"josé" OR "müller"'
+    assert search.build_match_query("C++ c#") == '"c++" OR "c#"'
+    assert search.build_match_query('a"b') == '"a" OR "b"'
+
+@pytest.mark.parametrize("query,expected", [
+    ("José Müller", "jose"),
+    ("josé", "jose"),
+    ("c++", "jose"),
+    ("数据工程师", "li"),
+])
+def test_search_matches_indexed_text(db, indexed, query, expected):
+    ids = [r["candidate_id"] for r in search.search_candidates(db, query)]
+    assert indexed[expected] in ids
@@ -0,0 +1,21 @@
+# tests/test_versions.py
+import os
+import sys
+import subprocess
+from backend import versions
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_import_creates_nothing(tmp_path):
+    # fresh interpreter: this process has already imported the module
+    subprocess.run([sys.executable, "-c", "import backend.versions"], cwd=tmp_path, check=True,
+                   env={**os.environ, "PYTHONPATH": ROOT})
+    assert list(tmp_path.iterdir()) == []
+
+def test_bump_creates_version_dir(tmp_path, monkeypatch):
+    target = tmp_path / "versions"
+    monkeypatch.setattr(versions, "VERSION_DIR", str(target))
+    assert versions.get_version("jobs") == 0
+    versions.bump("jobs")
+    assert target.is_dir()
+    assert versions.get_version("jobs") > 0